@@ -0,0 +1,196 @@
+# AsyncSearch.py
+""" asyncio versions of ASTAR, BestFS and DepthFS
+
+The searches are the same as in EightPuzzle_Main.py, but every yieldEvery
+boards explored they hand control back to the event loop, so many solves
+can share one asyncio app without blocking it. That is also where they can
+be cancelled: task.cancel(), asyncio.wait_for() and asyncio.timeout() all
+work. Instead of printing "still searching..." they report a Progress to
+the progress callback (if given) at every yield.
+
+    result = await asyncio.wait_for(asyncASTAR(board, progress=print), timeout=2.0)
+
+Try it with:   python AsyncSearch.py [boards] [timeout]
+"""
+
+import asyncio
+import math
+import sys
+import timeit
+from BoardClass import *
+from VisitedSet import VISITED_SETS
+from OpenList import OPEN_LISTS
+from SearchResult import SearchResult, pathOf
+from SolutionWriter import SolutionWriter, solutionWriter
+
+# boards explored between yields to the event loop
+YIELD_EVERY = 100
+
+class Progress():
+    """How far a running search has got"""
+
+    __slots__ = ('Algorithm', 'Explored', 'Frontier', 'BestF', 'Time')
+
+    #=====================================================
+    def __init__(self, algorithm: str, explored: int, frontier: int, bestF: float, time: float) -> None:
+        """Constructor; bestF: for ASTAR the f of the board expanded last (a lower bound on the
+        solution's moves), else the lowest f of any board expanded so far; time: seconds"""
+
+        self.Algorithm = algorithm
+        self.Explored = explored
+        self.Frontier = frontier
+        self.BestF = bestF
+        self.Time = time
+
+    #=====================================================
+    def __repr__(self) -> str:
+
+        return "Progress(%s, explored=%d, frontier=%d, best f=%g, time=%.3fms)" % (
+            self.Algorithm, self.Explored, self.Frontier, self.BestF, self.Time * 1000)
+
+
+#=====================================================
+async def searchAsync(startingBoard: BoardClass, algorithm: str = 'ASTAR', heuristic: str = None,
+                      openList: str = 'bucket', visited: str = 'hash', yieldEvery: int = YIELD_EVERY,
+                      progress=None, maxExplored: int = 10000, output: SolutionWriter = None) -> SearchResult:
+    """Solve by 'ASTAR' (open list by Cost), 'BestFS' (open list by Heuristic) or 'DepthFS'
+    (a stack), yielding to the event loop every yieldEvery boards explored
+    (heuristic: name of a Heuristics.HEURISTICS entry to use in this search only, default the current one;
+    openList: name of the OpenList.OPEN_LISTS backend to use;
+    visited: name of the VisitedSet.VISITED_SETS backend to use ('bitset': 3x3 and smaller);
+    progress: called with a Progress at every yield; maxExplored: give up after that many boards;
+    output: SolutionWriter or mode name ('pretty', 'moves', 'json', 'none') for the path)"""
+
+    if algorithm not in ('ASTAR', 'BestFS', 'DepthFS'):
+        raise ValueError("unknown algorithm: %s (choose from ASTAR, BestFS, DepthFS)" % algorithm)
+
+    # this search's own heuristic (the others running meanwhile may use another one):
+    # its boards get a copy of the size, rather than a BoardClass.useHeuristic() switch
+    startingBoard = startingBoard.copyCTOR()
+    startingBoard.Size = startingBoard.Size.withHeuristic(heuristic or startingBoard.Size.ActiveHeuristic.Name)
+    startingBoard.computeDistanceFromGoal()
+    startingBoard.Cost = startingBoard.Heuristic + startingBoard.PathLength
+
+    # the frontier: an open list ordered by Cost or Heuristic, or a stack for DepthFS
+    if algorithm == 'DepthFS':
+        Q = []
+        push = Q.append
+        pop = Q.pop
+    else:
+        Q = OPEN_LISTS[openList]()
+        key = 'Cost' if algorithm == 'ASTAR' else 'Heuristic'
+        push = lambda board: Q.push(getattr(board, key), board)
+        pop = lambda: Q.pop()[1]
+
+    push(startingBoard)
+    visited = VISITED_SETS[visited](startingBoard.Size)
+
+    # helper variables
+    goalNode = None
+    nextTry = 0
+    maxQueueSize = 0
+    bestF = math.inf
+
+    # start the timer
+    startTime = timeit.default_timer()
+
+    while Q:
+        # Track max frontier size
+        maxQueueSize = max(maxQueueSize, len(Q))
+
+        currentNode = pop()
+
+        # Check if the current node has been visited before
+        if visited.seen(currentNode): continue
+
+        # not visited? visit it
+        visited.add(currentNode)
+        bestF = currentNode.Cost if algorithm == 'ASTAR' else min(bestF, currentNode.Cost)
+
+        # Check if the current node is the goal
+        if currentNode.isGoal():
+            goalNode = currentNode
+
+            # Stream the path from the start
+            solutionWriter(output).write(startingBoard, pathOf(goalNode), algorithm)
+            break
+
+        # Generate Children: check if children is in visited set, if not add to the frontier, else skip
+        for child in currentNode.createChildrenBoards():
+            if not visited.seen(child):
+                push(child)
+
+        # Progress counter/ program stopper
+        nextTry += 1
+        if nextTry >= maxExplored:
+            break
+        if nextTry % yieldEvery == 0:
+            if progress is not None:
+                progress(Progress(algorithm, nextTry, len(Q), bestF, timeit.default_timer() - startTime))
+            # let the other tasks run (a cancel or timeout raises CancelledError here)
+            await asyncio.sleep(0)
+
+    return SearchResult(algorithm, pathOf(goalNode), nextTry, maxQueueSize, visited.Duplicates,
+                        timeit.default_timer() - startTime, 1.0 if algorithm == 'ASTAR' else math.inf)
+
+#=====================================================
+async def asyncASTAR(startingBoard: BoardClass, **kwargs) -> SearchResult:
+    """A* search that yields to the event loop (see searchAsync() for kwargs)"""
+
+    return await searchAsync(startingBoard, 'ASTAR', **kwargs)
+
+#=====================================================
+async def asyncBestFS(startingBoard: BoardClass, **kwargs) -> SearchResult:
+    """Best First Search that yields to the event loop (see searchAsync() for kwargs)"""
+
+    return await searchAsync(startingBoard, 'BestFS', **kwargs)
+
+#=====================================================
+async def asyncDepthFS(startingBoard: BoardClass, **kwargs) -> SearchResult:
+    """Depth First Search that yields to the event loop (see searchAsync() for kwargs)"""
+
+    return await searchAsync(startingBoard, 'DepthFS', **kwargs)
+
+
+#-----------\
+# START HERE \
+#-----------------------------------------------------------
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 6
+    timeout = float(sys.argv[2]) if len(sys.argv) > 2 else 0.5
+
+    async def solveAll() -> None:
+        # every searcher on every board at once, each with a timeout, plus a ticker
+        # showing the event loop stays responsive
+        ticks = 0
+
+        async def ticker() -> None:
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        async def solve(number: int, board: BoardClass, searcher) -> None:
+            last = []
+            try:
+                result = await asyncio.wait_for(searcher(board, output='none', progress=last.append), timeout)
+                print("board %d: %s" % (number, result))
+            except asyncio.TimeoutError:
+                print("board %d: %s timed out at %s" % (number, searcher.__name__, last[-1] if last else "the start"))
+
+        tick = asyncio.create_task(ticker())
+        startTime = timeit.default_timer()
+        jobs = []
+        for number in range(count):
+            board = BoardClass()
+            board.initializePuzzleBoard()
+            for searcher in (asyncASTAR, asyncBestFS, asyncDepthFS):
+                jobs.append(solve(number, board.copyCTOR(), searcher))
+        await asyncio.gather(*jobs)
+        tick.cancel()
+        print("%d solves in %.3f seconds; the event loop ticked %d times meanwhile" % (
+            len(jobs), timeit.default_timer() - startTime, ticks))
+
+    asyncio.run(solveAll())
+
+#-----------------------------------------------------
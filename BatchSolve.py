@@ -0,0 +1,166 @@
+# BatchSolve.py
+""" Solve many boards at once on a pool of worker processes
+
+Boards are sent to the workers as (N, State) ints, every worker runs the
+chosen searcher with its console output and stats csv turned off, and the
+results come back as they finish.
+
+Run a batch of random boards with:   python BatchSolve.py [count] [algorithm] [workers]
+"""
+
+import multiprocessing
+import os
+import sys
+import timeit
+from BoardClass import *
+from SearchResult import SearchResult
+from SolutionCache import SolutionCache
+
+# searchers (in EightPuzzle_Main.py) solveMany() can run
+ALGORITHMS = ('ASTAR', 'BestFS', 'DepthFS', 'IDASTAR', 'BIDIRECTIONAL', 'SMASTAR', 'ANYTIME', 'DatabaseSearch')
+
+class BatchReport():
+    """Search statistics of a batch, merged per worker process"""
+
+    #=====================================================
+    def __init__(self) -> None:
+        """Constructor to initialize an empty report"""
+
+        # worker pid -> [solves, solved, boards explored, moves, search time (seconds)]
+        self.Workers = {}
+
+        # wall clock time of the whole batch (set by solveMany())
+        self.WallTime = 0.0
+
+    #=====================================================
+    def add(self, worker: int, result: SearchResult) -> None:
+        """Count one solve done by worker"""
+
+        totals = self.Workers.setdefault(worker, [0, 0, 0, 0, 0.0])
+        totals[0] += 1
+        if result.Solved:
+            totals[1] += 1
+            totals[3] += result.Moves
+        totals[2] += result.Explored
+        totals[4] += result.Time
+
+    #=====================================================
+    def total(self) -> list:
+        """Totals over all workers: [solves, solved, boards explored, moves, search time (seconds)]"""
+
+        totals = [0, 0, 0, 0, 0.0]
+        for worker in self.Workers.values():
+            for i in range(len(totals)):
+                totals[i] += worker[i]
+
+        return totals
+
+    #=====================================================
+    def write(self, path: str = "BatchReport.csv") -> None:
+        """Write the per worker and total statistics to a csv file"""
+
+        FOUT = open(path, 'w')
+        FOUT.write("Batch Solve Stats\n")
+        FOUT.write("Worker, Solves, Solved, Boards Explored, Total Moves, Search Time(milliseconds)\n")
+
+        for worker, totals in sorted(self.Workers.items()):
+            FOUT.write("%d,%d,%d,%d,%d,%.12f\n" % (worker, totals[0], totals[1], totals[2], totals[3], totals[4]*1000))
+
+        totals = self.total()
+        FOUT.write("All,%d,%d,%d,%d,%.12f\n" % (totals[0], totals[1], totals[2], totals[3], totals[4]*1000))
+        FOUT.write("Wall Time(milliseconds): %.12f\n" % (self.WallTime*1000))
+        if self.WallTime > 0:
+            FOUT.write("Solves per second: %.3f\n" % (totals[0] / self.WallTime))
+
+        FOUT.close()
+
+
+#=====================================================
+def initWorker(heuristic: str) -> None:
+    """Pool initializer: silence the searchers' console output and pick the heuristic"""
+
+    sys.stdout = open(os.devnull, 'w')
+
+    if heuristic is not None:
+        BoardClass.useHeuristic(heuristic)
+
+#=====================================================
+def solveEncoded(task: tuple) -> tuple:
+    """Worker: solve one (index, (N, State), algorithm) task; returns (index, worker pid, SearchResult)"""
+
+    import EightPuzzle_Main
+
+    index, (N, state), algorithm = task
+    board = BoardClass.fromState(state, N)
+
+    result = getattr(EightPuzzle_Main, algorithm)(board, statsFile=None, output='none')
+
+    return index, os.getpid(), result
+
+#=====================================================
+def solveMany(boards: list[BoardClass], algorithm: str = 'ASTAR', workers: int = None,
+              heuristic: str = None, report: BatchReport = None, cache: SolutionCache = None):
+    """Solve boards on a pool of workers (default one per core), yielding
+    (index into boards, SearchResult) in the order the solves finish;
+    every result is also added to report (if given). Boards found in cache
+    (if given) are yielded first without a solve, the rest are cached as they finish"""
+
+    if algorithm not in ALGORITHMS:
+        raise ValueError("unknown algorithm: %s (choose from %s)" % (algorithm, ", ".join(ALGORITHMS)))
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    startTime = timeit.default_timer()
+
+    tasks = []
+    for i, board in enumerate(boards):
+        if cache is not None:
+            path = cache.get(board, algorithm, heuristic)
+            if path is not None:
+                result = SearchResult(algorithm, list(path), 0, 0, 0, 0.0)
+                if report is not None:
+                    report.add(os.getpid(), result)
+                yield i, result
+                continue
+        tasks.append((i, (board.Size.N, board.State), algorithm))
+
+    # a few chunks per worker keeps the pool busy without a round trip per board
+    chunkSize = max(1, len(tasks) // (workers * 8))
+
+    if tasks:
+        with multiprocessing.Pool(workers, initializer=initWorker, initargs=(heuristic,)) as pool:
+            for index, worker, result in pool.imap_unordered(solveEncoded, tasks, chunkSize):
+                if cache is not None:
+                    cache.put(boards[index], algorithm, heuristic, result.Path, result.Bound)
+                if report is not None:
+                    report.add(worker, result)
+                yield index, result
+
+    if report is not None:
+        report.WallTime = timeit.default_timer() - startTime
+
+
+#-----------\
+# START HERE \
+#-----------------------------------------------------------
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    algorithm = sys.argv[2] if len(sys.argv) > 2 else 'ASTAR'
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else None
+
+    boards = []
+    for i in range(count):
+        b = BoardClass()
+        b.initializePuzzleBoard()
+        boards.append(b)
+
+    report = BatchReport()
+    for index, result in solveMany(boards, algorithm, workers, report=report):
+        pass
+    report.write()
+
+    totals = report.total()
+    print("%s: solved %d of %d boards in %.3f seconds" % (algorithm, totals[1], totals[0], report.WallTime))
+
+#-----------------------------------------------------
@@ -0,0 +1,297 @@
+# Benchmark.py
+""" Repeatable benchmarks of the searchers
+
+Boards come from a seeded corpus, bucketed into difficulty tiers by their
+optimal number of moves (exact, from the StateDatabase, for 3x3 boards;
+wider boards are scrambled by a seeded random walk of the tier's length).
+Every searcher gets warmup runs, then timed trials, and reports per tier
+the median and 95th percentile solve time, boards explored, boards
+explored per second and peak memory. Results can be saved as a baseline
+JSON and later runs compared against it.
+
+    python Benchmark.py                      run and write Benchmark.csv
+    python Benchmark.py save [baseline]      ... and save the baseline JSON
+    python Benchmark.py compare [baseline]   ... and flag regressions (exit code 1)
+    python Benchmark.py imports              only check the import time budget (exit code 1 if over)
+"""
+
+import contextlib
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import timeit
+import tracemalloc
+import numpy as np
+from BoardClass import *
+from SolutionCache import INFORMED
+
+# tier -> (fewest, most) optimal moves
+TIERS = {
+    'easy': (1, 10),
+    'medium': (11, 20),
+    'hard': (21, 31),
+}
+
+# searchers benchmarked by default (DepthFS gives up on most boards)
+ALGORITHMS = ('ASTAR', 'BestFS', 'IDASTAR', 'BIDIRECTIONAL', 'SMASTAR')
+
+# default corpus seed, boards per tier, warmup runs and timed trials
+SEED = 8
+BOARDS_PER_TIER = 5
+WARMUP = 1
+TRIALS = 5
+
+BASELINE_FILE = "BenchmarkBaseline.json"
+
+# allowed slowdown (fraction) before a time or memory change counts as a regression,
+# and the smallest time change (milliseconds) that can count at all
+TOLERANCE = 0.25
+MIN_DELTA_MS = 0.5
+
+# most milliseconds importing the CLI's module may take (in a fresh interpreter; it
+# measures about 11ms, the budget leaves room for slower machines), and modules it
+# must not load up front (the searchers that need them import them on first use)
+IMPORT_BUDGET_MS = 50
+IMPORT_MODULE = 'EightPuzzle_Main'
+HEAVY_MODULES = ('numpy', 'multiprocessing', 'sqlite3', 'json', 'threading', 'mmap')
+
+
+#=====================================================
+def makeCorpus(seed: int = SEED, perTier: int = BOARDS_PER_TIER, N: int = 3) -> dict:
+    """Deterministic boards for every tier: tier -> list of (State, optimal moves)
+    (for N > 3 the moves are the random walk's length, an upper bound)"""
+
+    from Generator import generate
+
+    # exact distances for 3x3 (from the StateDatabase), random walks of that length for wider boards
+    rng = np.random.default_rng(seed)
+    corpus = {}
+    for tier, (fewest, most) in TIERS.items():
+        states, moves = generate(perTier, rng, fewest, most, N, depths=True)
+        corpus[tier] = [(int(state), int(move)) for state, move in zip(states, moves)]
+
+    return corpus
+
+#=====================================================
+def percentile(values: list[float], fraction: float) -> float:
+    """The value below which fraction of values fall (nearest rank)"""
+
+    values = sorted(values)
+    return values[max(0, math.ceil(fraction * len(values)) - 1)]
+
+#=====================================================
+def calibrate(repeats: int = 5) -> float:
+    """Median time (milliseconds) of a fixed workload, so a baseline from a faster
+    or busier machine can be compared by scaling the times"""
+
+    times = []
+    for i in range(repeats):
+        startTime = timeit.default_timer()
+        board = BoardClass.fromState(BoardClass.getSize(3).GoalState, 3)
+        for j in range(20000):
+            targets = board.Size.Neighbors[board.Blank]
+            board.moveBlank(targets[j % len(targets)])
+        times.append(timeit.default_timer() - startTime)
+
+    return percentile(times, 0.5) * 1000
+
+#=====================================================
+def importTime(module: str = IMPORT_MODULE, repeats: int = 5) -> tuple:
+    """(median milliseconds, HEAVY_MODULES loaded) of importing module in a fresh interpreter"""
+
+    code = ("import sys, time\n"
+            "startTime = time.perf_counter()\n"
+            "import %s\n"
+            "print((time.perf_counter() - startTime) * 1000)\n"
+            "print(' '.join(name for name in %r if name in sys.modules))\n" % (module, HEAVY_MODULES))
+
+    times = []
+    for i in range(repeats):
+        lines = subprocess.run([sys.executable, '-c', code], cwd=os.path.dirname(os.path.abspath(__file__)),
+                               capture_output=True, text=True, check=True).stdout.split("\n")
+        times.append(float(lines[0]))
+
+    return percentile(times, 0.5), lines[1].split()
+
+#=====================================================
+def checkImports(budget: float = IMPORT_BUDGET_MS, module: str = IMPORT_MODULE) -> list[str]:
+    """Problems with module's startup: over budget milliseconds to import, or loading HEAVY_MODULES"""
+
+    milliseconds, heavy = importTime(module)
+    print("import %s: %.1fms (budget %.0fms)" % (module, milliseconds, budget))
+
+    problems = []
+    if milliseconds > budget:
+        problems.append("import %s: %.1fms, over the %.0fms budget" % (module, milliseconds, budget))
+    if heavy:
+        problems.append("import %s: loads %s up front" % (module, ", ".join(heavy)))
+
+    return problems
+
+#=====================================================
+def runSearcher(algorithm: str, state: int, N: int, heuristic: str = None):
+    """One silent solve of a board by the named searcher; returns its SearchResult"""
+
+    import EightPuzzle_Main
+
+    board = BoardClass.fromState(state, N)
+    kwargs = {'statsFile': None, 'output': 'none'}
+    if heuristic is not None and algorithm in INFORMED:
+        kwargs['heuristic'] = heuristic
+
+    with open(os.devnull, 'w') as DEVNULL, contextlib.redirect_stdout(DEVNULL):
+        return getattr(EightPuzzle_Main, algorithm)(board, **kwargs)
+
+#=====================================================
+def benchmark(algorithms: tuple = ALGORITHMS, corpus: dict = None, N: int = 3, warmup: int = WARMUP,
+              trials: int = TRIALS, heuristic: str = None) -> dict:
+    """Time every searcher on every tier of corpus (default makeCorpus()):
+    returns algorithm -> tier -> {median_ms, p95_ms, nodes, nodes_per_sec, peak_kb, solved}"""
+
+    if corpus is None:
+        corpus = makeCorpus(N=N)
+
+    results = {}
+    for algorithm in algorithms:
+        results[algorithm] = {}
+        for tier, boards in corpus.items():
+            for i in range(warmup):
+                for state, moves in boards:
+                    runSearcher(algorithm, state, N, heuristic)
+
+            times = []
+            nodes = 0
+            solved = 0
+            for i in range(trials):
+                for state, moves in boards:
+                    startTime = timeit.default_timer()
+                    result = runSearcher(algorithm, state, N, heuristic)
+                    times.append(timeit.default_timer() - startTime)
+                    nodes += result.Explored
+                    solved += result.Solved
+
+            # peak memory gets its own (untimed) pass: tracing slows the searchers down
+            peak = 0
+            for state, moves in boards:
+                tracemalloc.start()
+                runSearcher(algorithm, state, N, heuristic)
+                peak = max(peak, tracemalloc.get_traced_memory()[1])
+                tracemalloc.stop()
+
+            results[algorithm][tier] = {
+                'median_ms': percentile(times, 0.5) * 1000,
+                'p95_ms': percentile(times, 0.95) * 1000,
+                'nodes': nodes / len(times),
+                'nodes_per_sec': nodes / sum(times) if sum(times) > 0 else 0.0,
+                'peak_kb': peak / 1024,
+                'solved': solved / len(times),
+            }
+
+    return results
+
+#=====================================================
+def writeReport(results: dict, path: str = "Benchmark.csv") -> None:
+    """Write the benchmark results to a csv file"""
+
+    FOUT = open(path, 'w')
+    FOUT.write("Benchmark Results\n")
+    FOUT.write("Algorithm, Tier, Median Time(milliseconds), P95 Time(milliseconds), Boards Explored, Boards per Second, Peak Memory(KB), Solved\n")
+
+    for algorithm, tiers in results.items():
+        for tier, row in tiers.items():
+            FOUT.write("%s,%s,%.6f,%.6f,%.1f,%.1f,%.1f,%.2f\n" % (algorithm, tier, row['median_ms'], row['p95_ms'],
+                       row['nodes'], row['nodes_per_sec'], row['peak_kb'], row['solved']))
+
+    FOUT.close()
+
+#=====================================================
+def saveBaseline(results: dict, path: str = BASELINE_FILE, seed: int = SEED, perTier: int = BOARDS_PER_TIER,
+                 calibration: float = None) -> None:
+    """Save results (and how they were made) as a baseline JSON"""
+
+    baseline = {
+        'calibration_ms': calibration,
+        'seed': seed,
+        'boards_per_tier': perTier,
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'results': results,
+    }
+    with open(path, 'w') as FOUT:
+        json.dump(baseline, FOUT, indent=2, sort_keys=True)
+
+#=====================================================
+def compareBaseline(results: dict, path: str = BASELINE_FILE, tolerance: float = TOLERANCE,
+                    calibration: float = None) -> list[str]:
+    """Regressions of results against the baseline JSON in path: median/p95 time or
+    peak memory more than tolerance worse, any rise in boards explored or drop in solves.
+    With both calibrations (see calibrate()) the baseline times are scaled to this machine"""
+
+    with open(path) as FIN:
+        baseline = json.load(FIN)
+
+    scale = 1.0
+    if calibration and baseline.get('calibration_ms'):
+        scale = calibration / baseline['calibration_ms']
+
+    regressions = []
+    for algorithm, tiers in results.items():
+        for tier, row in tiers.items():
+            old = baseline['results'].get(algorithm, {}).get(tier)
+            if old is None:
+                continue
+
+            for key in ('median_ms', 'p95_ms'):
+                expected = old[key] * scale
+                if row[key] > expected * (1 + tolerance) and row[key] - expected >= MIN_DELTA_MS:
+                    regressions.append("%s %s: %s %.3f -> %.3f (+%.0f%%)" % (
+                        algorithm, tier, key, expected, row[key], (row[key] / expected - 1) * 100))
+            for key in ('peak_kb',):
+                if row[key] > old[key] * (1 + tolerance):
+                    regressions.append("%s %s: %s %.1f -> %.1f (+%.0f%%)" % (
+                        algorithm, tier, key, old[key], row[key], (row[key] / old[key] - 1) * 100))
+            for key in ('nodes',):
+                if row[key] > old[key]:
+                    regressions.append("%s %s: %s %.1f -> %.1f" % (algorithm, tier, key, old[key], row[key]))
+            if row['solved'] < old['solved']:
+                regressions.append("%s %s: solved %.2f -> %.2f" % (algorithm, tier, old['solved'], row['solved']))
+
+    return regressions
+
+
+#-----------\
+# START HERE \
+#-----------------------------------------------------------
+if __name__ == '__main__':
+    mode = sys.argv[1] if len(sys.argv) > 1 else 'run'
+    path = sys.argv[2] if len(sys.argv) > 2 else BASELINE_FILE
+
+    problems = checkImports()
+    if mode == 'imports':
+        for problem in problems:
+            print("REGRESSION: %s" % problem)
+        sys.exit(1 if problems else 0)
+
+    calibration = calibrate()
+    results = benchmark()
+    writeReport(results)
+
+    for algorithm, tiers in results.items():
+        for tier, row in tiers.items():
+            print("%-14s %-7s median %9.3fms  p95 %9.3fms  %8.1f boards  %9.0f boards/s  %8.1fKB" % (
+                algorithm, tier, row['median_ms'], row['p95_ms'], row['nodes'], row['nodes_per_sec'], row['peak_kb']))
+
+    if mode == 'save':
+        saveBaseline(results, path, calibration=calibration)
+        print("Saved baseline to %s" % path)
+    elif mode == 'compare':
+        regressions = problems + compareBaseline(results, path, calibration=calibration)
+        for regression in regressions:
+            print("REGRESSION: %s" % regression)
+        print("%d regressions against %s" % (len(regressions), path))
+        sys.exit(1 if regressions else 0)
+
+#-----------------------------------------------------
@@ -2,35 +2,188 @@
 """ Class for instances of 8puzzle Boards
 """
 
-import string
+import math
+import random
+from array import array
+
+class BoardSize():
+    """Everything about an NxN board that only depends on N (and its GOAL);
+    one instance is shared by all boards of that size (see BoardClass.getSize())"""
+
+    #=====================================================
+    def __init__(self, N: int, goal: list[list[int]]) -> None:
+        """Constructor to precompute the tables for NxN boards with the given GOAL"""
+
+        self.N = N
+        self.NN = N * N
+
+        # packed State layout: the tile in cell i (row major) lives in bits [BITS*i, BITS*i + BITS)
+        self.BITS = max(1, (self.NN - 1).bit_length())
+        self.MASK = (1 << self.BITS) - 1
+
+        self.GOAL = [list(row) for row in goal]
+        self.GoalState = BoardClass.pack(self.GOAL, self)
+
+        # hash table of (row,col) locations for each tile in the GOAL
+        # e.g.  GoalTiles[0] = [0,0]
+        self.GoalTiles = [None] * self.NN
+        for row in range(N):
+            for col in range(N):
+                self.GoalTiles[self.GOAL[row][col]] = [row, col]
+
+        # isSolvable() parity every board that can reach the GOAL shares
+        self.GoalParity = self.parity([tile for row in self.GOAL for tile in row])
+
+        # Neighbors[cell] = cells the empty tile can slide to from cell: UP, RIGHT, DOWN, LEFT order
+        self.Neighbors = []
+        for cell in range(self.NN):
+            row, col = divmod(cell, N)
+            cells = []
+            if ( row != 0 ): cells.append(cell - N)
+            if ( col != (N - 1) ): cells.append(cell + 1)
+            if ( row != (N - 1) ): cells.append(cell + N)
+            if ( col != 0 ): cells.append(cell - 1)
+            self.Neighbors.append(cells)
+
+        # how far the empty tile's cell moves for each move code (UP, RIGHT, DOWN, LEFT;
+        # see NodeArena), and the move code of each of those steps
+        self.MoveSteps = (-N, 1, N, -1)
+        self.MoveCodes = {step: code for code, step in enumerate(self.MoveSteps)}
+
+        # heuristic used by computeDistanceFromGoal() for this size (set by useHeuristic());
+        # DistanceTable is its [tile][cell] cost table, used to update the heuristic
+        # per move in moveBlank(), or None if the heuristic is not a per tile sum
+        self.Heuristics = {}
+        self.ActiveHeuristic = None
+        self.DistanceTable = None
+        self.useHeuristic(BoardClass.HeuristicName)
+
+    #=====================================================
+    def parity(self, arr: list[int]) -> int:
+        """Number of inversions of the non-blank tiles (plus the blank's row on even
+        widths) mod 2; sliding the empty tile never changes it"""
+
+        # the inversions' parity is the parity of the tiles' permutation: its length less
+        # its number of cycles (O(N^2), not a count of all O(N^4) pairs)
+        order = [tile - 1 for tile in arr if tile != 0]
+        seen = [False] * len(order)
+        swaps = 0
+        for start in range(len(order)):
+            if seen[start]: continue
+            cell = start
+            while not seen[cell]:
+                seen[cell] = True
+                cell = order[cell]
+                swaps += 1
+            swaps -= 1
+
+        # on even widths an UP/DOWN move jumps an odd number of tiles, flipping the inversion parity
+        if self.N % 2 == 0:
+            swaps += arr.index(0) // self.N
+
+        return swaps % 2
+
+    #=====================================================
+    def useHeuristic(self, name: str) -> None:
+        """Switch the heuristic used by boards of this size (its tables are built once, on first use)"""
+
+        from Heuristics import getHeuristic
+        self.ActiveHeuristic = getHeuristic(name, self)
+        self.DistanceTable = self.ActiveHeuristic.Table
+
+    #=====================================================
+    def withHeuristic(self, name: str) -> 'BoardSize':
+        """A copy of this size (sharing its tables) whose boards use the named heuristic,
+        whatever BoardClass.useHeuristic() switches every other board to"""
+
+        size = BoardSize.__new__(BoardSize)
+        size.__dict__.update(self.__dict__)
+        size.useHeuristic(name)
+
+        return size
+
+
+class NodeArena():
+    """Parent links of the boards made by slideBlank() in one search, so a board doesn't
+    keep the board it was made from alive: board number i (its Trail) was made from board
+    Parents[i] (-1 = the starting board) by moving the empty tile in direction move(i)"""
+
+    #=====================================================
+    def __init__(self) -> None:
+        """Constructor to initialize an empty arena"""
+
+        self.Parents = array('i')
+        # 2 bit move codes (0 UP, 1 RIGHT, 2 DOWN, 3 LEFT), four to a byte
+        self.Moves = bytearray()
+
+    #=====================================================
+    def add(self, parent: int, move: int) -> int:
+        """Record a board made from board parent by move; returns its number"""
+
+        index = len(self.Parents)
+        self.Parents.append(parent)
+        if index & 3 == 0:
+            self.Moves.append(move)
+        else:
+            self.Moves[index >> 2] |= move << ((index & 3) * 2)
+
+        return index
+
+    #=====================================================
+    def move(self, index: int) -> int:
+        """Move code that made board number index"""
+
+        return (self.Moves[index >> 2] >> ((index & 3) * 2)) & 3
+
+    #=====================================================
+    def __len__(self) -> int:
+
+        return len(self.Parents)
+
 
 class BoardClass():
     """NxN board to solve [(N^2)-1]-puzzle"""
 
+    # the tiles are packed into one int (State) so each board only costs a
+    # few slots instead of a 3x3 list of lists plus a __dict__;
+    # Size is the BoardSize shared by all boards of the same width;
+    # the Parent board is not kept, only the move to it (Trail, into the search's Arena)
+    __slots__ = ('State', 'Blank', 'Size', 'Trail', 'Arena', 'PathLength', 'Heuristic', 'Cost')
+
     # class members (all instances use these same values)
+    # default board width (boards can be any size, see getSize())
     N = 3
 
     GOAL  = [ [0, 1, 2], [3, 4, 5], [6, 7, 8] ]
 
-    # used with Manhattan Distance heuristic only:
+    # GoalTiles/GoalState of the default (N x N) size (set by getSize(), when first used):
     # hash table of (row,col) locations for each tile
-    # (set in initializeBoard() below)
     # e.g.  BoardClass.GoalTiles[0] = [0,0]
     GoalTiles = [[0,0], [0,1], [0,2], [1,0], [1,1], [1,2], [2,0], [2,1], [2,2]]
 
+    # packed form of GOAL
+    GoalState = 0
+
+    # name of the heuristic (in Heuristics.HEURISTICS) every board size uses
+    HeuristicName = 'manhattan'
+
+    # width -> BoardSize
+    Sizes = {}
+
     #=====================================================
-    def __init__(self) -> None:
-        """Constructor to initialize the board and its attributes"""
-        
+    def __init__(self, N: int = None) -> None:
+        """Constructor to initialize an NxN board (default BoardClass.N) and its attributes"""
+
+        self.Size = BoardClass.getSize(N)
+
         # setup board (set bogus values)
-        self.Board = [[-1, -1, -1], [-1, -1, -1], [-1, -1, -1]]
-        # (X,Y) = current location of the EMPTY TILE (0)
-        self.X = -1   # ROW
-        self.Y = -1   # COL
+        self.State = -1
+        # cell index (row * N + col) of the EMPTY TILE (0), see X/Y below
+        self.Blank = -1
 
         # set bogus values for Parent, PathLength, Heuristic, Cost
-        import math
-        self.Parent = None
+        self.Trail = -1
+        self.Arena = None
         self.PathLength = math.inf
         self.Heuristic = math.inf
         self.Cost = math.inf
@@ -39,18 +192,15 @@ class BoardClass():
     def copyCTOR(self) -> 'BoardClass':
         """Creates a copy of the current board"""
 
-        newBoard = BoardClass()
-        newBoard.Board = []
-
-        # copy the boards data
-        for nextRow in self.Board:
-            newRow = []
-            for nextTile in nextRow:
-                newRow.append(nextTile)
-            newBoard.Board.append(newRow)
-        newBoard.X = self.X
-        newBoard.Y = self.Y
-        newBoard.Parent = self.Parent
+        # skip __init__ (and its getSize() lookup): every slot is set below
+        newBoard = BoardClass.__new__(BoardClass)
+
+        # copy the boards data (State is an immutable int, no deep copy needed)
+        newBoard.State = self.State
+        newBoard.Blank = self.Blank
+        newBoard.Size = self.Size
+        newBoard.Trail = self.Trail
+        newBoard.Arena = self.Arena
         newBoard.PathLength = self.PathLength
         newBoard.Heuristic = self.Heuristic
         newBoard.Cost = self.Cost
@@ -58,32 +208,144 @@ class BoardClass():
         return newBoard
 
     #=====================================================
-    def initializePuzzleBoard(self) -> None:
-        """Initialize a random solvable puzzle board and set goal tile locations."""
-        
-        # set (row,col) locations for each tile in the GOAL
-        for row in range(0, BoardClass.N):
-            for col in range(0, BoardClass.N):
-                BoardClass.GoalTiles[BoardClass.GOAL[row][col]] = [row, col]
-
-        # Generate/initialize a random solvable 8-puzzle board
-        import numpy as np
-        # generates till board is solvable
-        while True:
-            # generate a random 1D array of numbers 0 to 8
-            puzzle1d = np.arange(BoardClass.N * BoardClass.N)
-            np.random.shuffle(puzzle1d)
-            # reshape to matrix
-            self.Board = puzzle1d.reshape((BoardClass.N, BoardClass.N))
-            # find the empty tile
-            for i in range(BoardClass.N):
-                for j in range(BoardClass.N):
-                    if self.Board[i][j] == 0:
-                        self.X = i
-                        self.Y = j
-            # check if solvable
-            if self.isSolvable():
-                break
+    @staticmethod
+    def getSize(N: int = None) -> BoardSize:
+        """The BoardSize for NxN boards (default BoardClass.N), built on first use;
+        the default size follows BoardClass.GOAL, other sizes use the GOAL 0, 1, 2, ... in row order"""
+
+        if N is None:
+            N = BoardClass.N
+
+        size = BoardClass.Sizes.get(N)
+        if N == BoardClass.N and size is not None and size.GOAL != BoardClass.GOAL:
+            # the GOAL was edited: rebuild the default size
+            size = None
+
+        if size is None:
+            if N == BoardClass.N:
+                goal = BoardClass.GOAL
+            else:
+                goal = [[row * N + col for col in range(N)] for row in range(N)]
+            size = BoardSize(N, goal)
+            BoardClass.Sizes[N] = size
+
+            if N == BoardClass.N:
+                BoardClass.GoalTiles = size.GoalTiles
+                BoardClass.GoalState = size.GoalState
+
+        return size
+
+    #=====================================================
+    @staticmethod
+    def fromState(state: int, N: int = None) -> 'BoardClass':
+        """Creates a starting board (PathLength 0, no Parent) from a packed State of an NxN board"""
+
+        newBoard = BoardClass(N)
+        newBoard.State = state
+        newBoard.Blank = newBoard.tiles().index(0)
+        newBoard.PathLength = 0
+        newBoard.computeDistanceFromGoal()
+        newBoard.Cost = newBoard.Heuristic + newBoard.PathLength
+
+        return newBoard
+
+    #=====================================================
+    @staticmethod
+    def pack(board, size: BoardSize = None) -> int:
+        """Packs a list of lists (or NumPy matrix) of tiles into a State int
+        (laid out for size, default the size matching the board's width)"""
+
+        if size is None:
+            size = BoardClass.getSize(len(board))
+
+        state = 0
+        shift = 0
+        for row in board:
+            for tile in row:
+                state |= int(tile) << shift
+                shift += size.BITS
+
+        return state
+
+    #=====================================================
+    def tiles(self) -> list[int]:
+        """Unpacks the State into a flat (row major) list of tiles"""
+
+        state = self.State
+        MASK = self.Size.MASK
+        BITS = self.Size.BITS
+        arr = []
+        for i in range(self.Size.NN):
+            arr.append(state & MASK)
+            state >>= BITS
+
+        return arr
+
+    #=====================================================
+    def tileAt(self, index: int) -> int:
+        """Tile in cell index (row * N + col) of the packed State"""
+
+        return (self.State >> (index * self.Size.BITS)) & self.Size.MASK
+
+    #=====================================================
+    @property
+    def Board(self) -> list[list[int]]:
+        """list of lists view of the packed State (a copy, editing it does not change the board)"""
+
+        N = self.Size.N
+        arr = self.tiles()
+        return [arr[row * N:(row + 1) * N] for row in range(N)]
+
+    @Board.setter
+    def Board(self, board) -> None:
+        # the board's width picks its size
+        self.Size = BoardClass.getSize(len(board))
+        self.State = BoardClass.pack(board, self.Size)
+        # find the empty tile
+        self.Blank = self.tiles().index(0)
+
+    #=====================================================
+    @property
+    def X(self) -> int:
+        """ROW of the EMPTY TILE (0)"""
+
+        return self.Blank // self.Size.N
+
+    @X.setter
+    def X(self, row: int) -> None:
+        self.Blank = row * self.Size.N + self.Y
+
+    #=====================================================
+    @property
+    def Y(self) -> int:
+        """COL of the EMPTY TILE (0)"""
+
+        return self.Blank % self.Size.N
+
+    @Y.setter
+    def Y(self, col: int) -> None:
+        self.Blank = self.X * self.Size.N + col
+
+    #=====================================================
+    def initializePuzzleBoard(self, N: int = None) -> None:
+        """Initialize a random solvable NxN puzzle board (default BoardClass.N)."""
+
+        # (re)load the goal tile locations in case the GOAL was edited
+        if N is None:
+            N = BoardClass.N
+        self.Size = BoardClass.getSize(N)
+
+        # Generate/initialize a random solvable (N^2)-1 puzzle board
+        # (the standard library's shuffle: NumPy costs more to import than a whole solve)
+        arr = list(range(N * N))
+        random.shuffle(arr)
+        if self.Size.parity(arr) != self.Size.GoalParity:
+            # swapping two tiles (not the empty one) flips the parity: that maps the unsolvable
+            # boards one to one onto the solvable ones, so no board has to be thrown away
+            first, second = [cell for cell in range(3) if arr[cell] != 0][:2]
+            arr[first], arr[second] = arr[second], arr[first]
+        # reshape to matrix (packing it also finds the empty tile)
+        self.Board = [arr[row * N:(row + 1) * N] for row in range(N)]
 
         # easy (4 moves)
         # self.Board = [[3, 1, 2], [4, 7, 5], [6, 8, 0]]
@@ -121,7 +383,7 @@ class BoardClass():
 
 
         # Check empty tile in right spot and set default values for Parent, PathLength, Heuristic, Cost
-        assert (self.Board[self.X][self.Y] == 0)
+        assert (self.tileAt(self.Blank) == 0)
         self.PathLength = 0
         self.computeDistanceFromGoal()
         self.Cost = self.Heuristic + self.PathLength
@@ -130,107 +392,116 @@ class BoardClass():
     def createChildrenBoards(self) -> list['BoardClass']:
         """ Creates the set of potential children Boards from the current Board """
 
-        # get the current location of the empty tile
-        row = self.X
-        col = self.Y
-
-        assert( (row >=0 and row < BoardClass.N)
-                and
-                (col >=0 and col < BoardClass.N) )
-
-        newChildrenBoards = []
-
-        # UP(NORTH): slide empty (0) space up
-        if ( row != 0 ):
-            #print("Try North ...")
-            newBoard = self.copyCTOR()
-            newBoard.Parent = self
-            newBoard.Board[row-1][col], newBoard.Board[row][col] = newBoard.Board[row][col], newBoard.Board[row-1][col]
-            newBoard.X = row-1
-            newBoard.PathLength = self.PathLength + 1
-            newBoard.computeDistanceFromGoal()
-            newBoard.Cost = newBoard.Heuristic + newBoard.PathLength
-            newChildrenBoards.append( newBoard )
-
-        # RIGHT(EAST): slide empty (0) space to right
-        if ( col != (self.N - 1) ):
-            #print("Try East ...")
-            newBoard = self.copyCTOR()
-            newBoard.Parent = self
-            newBoard.Board[row][col+1], newBoard.Board[row][col] = newBoard.Board[row][col], newBoard.Board[row][col+1]
-            newBoard.Y = col+1
-            newBoard.PathLength = self.PathLength + 1
-            newBoard.computeDistanceFromGoal()
-            newBoard.Cost = newBoard.Heuristic + newBoard.PathLength
-            newChildrenBoards.append( newBoard )
-
-        # DOWN(SOUTH): slide empty (0) space down
-        if ( row != (self.N - 1) ):
-            #print("Try South ...")
-            newBoard = self.copyCTOR()
-            newBoard.Parent = self
-            newBoard.Board[row+1][col], newBoard.Board[row][col] = newBoard.Board[row][col], newBoard.Board[row+1][col]
-            newBoard.X = row+1
-            newBoard.PathLength = self.PathLength + 1
-            newBoard.computeDistanceFromGoal()
-            newBoard.Cost = newBoard.Heuristic + newBoard.PathLength
-            newChildrenBoards.append( newBoard )
-
-        # LEFT(WEST): slide empty (0) space to left
-        if ( col != 0 ):
-            #print("Try West ...")
-            newBoard = self.copyCTOR()
-            newBoard.Parent = self
-            newBoard.Board[row][col-1], newBoard.Board[row][col] = newBoard.Board[row][col], newBoard.Board[row][col-1]
-            newBoard.Y = col-1
-            newBoard.PathLength = self.PathLength + 1
-            newBoard.computeDistanceFromGoal()
-            newBoard.Cost = newBoard.Heuristic + newBoard.PathLength
-            newChildrenBoards.append( newBoard )
-
-        return newChildrenBoards
+        assert( self.Blank >= 0 and self.Blank < self.Size.NN )
+
+        # slide the empty (0) space UP(NORTH), RIGHT(EAST), DOWN(SOUTH), LEFT(WEST)
+        # wherever the board's edge allows it (precomputed in Size.Neighbors)
+        return [self.slideBlank(target) for target in self.Size.Neighbors[self.Blank]]
 
     #=====================================================
-    def computeDistanceFromGoal(self) -> None:
-        """Computes the Manhatten Distance from the Goal board,
-        where Manhatten Distance = (sum of misplaced distances for all tiles)"""
+    def slideBlank(self, target: int) -> 'BoardClass':
+        """Creates the child Board where the empty tile moved to cell target"""
+
+        newBoard = self.copyCTOR()
+        # record the move (a starting board's children begin a new arena)
+        if self.Trail < 0:
+            newBoard.Arena = NodeArena()
+        newBoard.Trail = newBoard.Arena.add(self.Trail, self.Size.MoveCodes[target - self.Blank])
+        newBoard.moveBlank(target)
+        newBoard.PathLength = self.PathLength + 1
+        newBoard.Cost = newBoard.Heuristic + newBoard.PathLength
+
+        return newBoard
+
+    #=====================================================
+    @property
+    def Parent(self) -> 'BoardClass':
+        """The board this one was made from by slideBlank() (None for a starting board),
+        rebuilt by undoing the move recorded in the Arena"""
+
+        if self.Trail < 0:
+            return None
+
+        parent = self.copyCTOR()
+        parent.moveBlank(self.Blank - self.Size.MoveSteps[self.Arena.move(self.Trail)])
+        parent.Trail = self.Arena.Parents[self.Trail]
+        parent.PathLength = self.PathLength - 1
+        parent.Cost = parent.Heuristic + parent.PathLength
+
+        return parent
+
+    @Parent.setter
+    def Parent(self, parent: 'BoardClass') -> None:
+        # only None (make this a starting board): links are made by slideBlank()
+        if parent is not None:
+            raise ValueError("a board's Parent is set by slideBlank(), only None can be assigned")
+        self.Trail = -1
+        self.Arena = None
 
-        sum = 0
+    #=====================================================
+    def moveBlank(self, target: int) -> None:
+        """Slides the empty tile to cell target IN PLACE and updates the Heuristic
+        (moving it back to the old Blank undoes the move; PathLength/Cost are left alone)"""
+
+        # the blank is 0, so its bits are already clear: just move the tile over
+        size = self.Size
+        blank = self.Blank
+        shift = target * size.BITS
+        tile = (self.State >> shift) & size.MASK
+
+        self.State = (self.State & ~(size.MASK << shift)) | (tile << (blank * size.BITS))
+        self.Blank = target
+
+        table = size.DistanceTable
+        if table is not None:
+            # only the moved tile and the blank changed cells, so update the heuristic:
+            # tile goes target -> blank, blank goes blank -> target
+            self.Heuristic += (table[tile][blank] - table[tile][target]
+                               + table[0][target] - table[0][blank])
+        else:
+            self.computeDistanceFromGoal()
 
-        for row in range(BoardClass.N):
-            for col in range(BoardClass.N):
-                curTile = self.Board[row][col]
+    #=====================================================
+    def neighborCells(self) -> list[int]:
+        """Cells the empty tile can slide to: UP, RIGHT, DOWN, LEFT order"""
 
-                goalRow, goalCol = BoardClass.GoalTiles[curTile]
-                sum += (abs(row - goalRow) + abs(col - goalCol))
+        return self.Size.Neighbors[self.Blank]
 
-        self.Heuristic = sum
-    #===================================================== 
-    '''
+    #=====================================================
     def computeDistanceFromGoal(self) -> None:
-        """Computes the number of misplaced tiles from the Goal board"""
-        numberMisplaced = 0
+        """Computes the active heuristic's distance from the Goal board
+        (see Heuristics.py; Manhattan Distance by default)"""
+
+        self.Heuristic = self.Size.ActiveHeuristic.evaluate(self)
+
+    #=====================================================
+    @staticmethod
+    def useHeuristic(name: str) -> None:
+        """Switch the heuristic used by every board, by its name in Heuristics.HEURISTICS:
+        'misplaced', 'manhattan', 'linear-conflict' or 'pdb'"""
+
+        from Heuristics import HEURISTICS
+        if name not in HEURISTICS:
+            raise ValueError("unknown heuristic: %s (choose from %s)" % (name, ", ".join(HEURISTICS)))
+
+        BoardClass.HeuristicName = name
+        for size in BoardClass.Sizes.values():
+            size.useHeuristic(name)
 
-        for row in range(BoardClass.N):
-            for col in range(BoardClass.N):
-                if (self.Board[row][col] != BoardClass.GOAL[row][col]):
-                    numberMisplaced += 1
-        
-        self.Heuristic = numberMisplaced
-    '''
     #=====================================================
     def __str__(self) -> str:
-        """ Prints the current Board positions """
+        """ The current Board positions as a grid """
 
-        print("-------------")
-        print("| %d | %d | %d |" % (self.Board[0][0], self.Board[0][1], self.Board[0][2]))
-        print("-------------")
-        print("| %d | %d | %d |" % (self.Board[1][0], self.Board[1][1], self.Board[1][2]))
-        print("-------------")
-        print("| %d | %d | %d |" % (self.Board[2][0], self.Board[2][1], self.Board[2][2]))
-        print("-------------")
+        # every tile is printed as wide as the largest one
+        width = len(str(self.Size.NN - 1))
+        line = "-" * ((width + 3) * self.Size.N + 1)
 
-        return ""
+        lines = [line]
+        for row in self.Board:
+            lines.append("| " + " | ".join("%*d" % (width, tile) for tile in row) + " |")
+            lines.append(line)
+
+        return "\n".join(lines)
 
     #=====================================================
     def sameBoard(self, otherBoard: 'BoardClass') -> bool:
@@ -238,40 +509,30 @@ class BoardClass():
         (note that this is different from metric of __eq__
         """
 
-        for row in range(BoardClass.N):
-            for col in range(BoardClass.N):
-                if (self.Board[row][col] != otherBoard.Board[row][col]): return False
+        return self.State == otherBoard.State
+
+    #=====================================================
+    def boardKey(self) -> int:
+        """Canonical (hashable) encoding of the tile placement (the packed State),
+        boards with the same key are sameBoard()
+        """
+
+        return self.State
 
-        return True
-    
     #=====================================================
     def isGoal(self) -> bool:
         """Check if the current board is the Goal board
         """
 
-        for row in range(BoardClass.N):
-            for col in range(BoardClass.N):
-                if (self.Board[row][col] != BoardClass.GOAL[row][col]): return False
-
-        return True
+        return self.State == self.Size.GoalState
 
     #=====================================================
     def isSolvable(self) -> bool:
-        """Check if the current board is solvable
+        """Check if the current board is solvable: its inversion parity
+        (see BoardSize.parity()) has to match the GOAL's
         """
 
-        # Flatten the 2D board array into a 1D array
-        arr = [tile for row in self.Board for tile in row]
-
-        # Count the number of inversions
-        inv_count = 0
-        for i in range(0, 9):
-            for j in range(i + 1, 9):
-                if arr[j] != 0 and arr[i] != 0 and arr[i] > arr[j]:
-                    inv_count += 1
-
-        # Check if the number of inversions is even
-        return (inv_count % 2 == 0)
+        return self.Size.parity(self.tiles()) == self.Size.GoalParity
 
 
 
@@ -316,3 +577,4 @@ class BoardClass():
 
 
         return same
+
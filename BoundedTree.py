@@ -0,0 +1,179 @@
+# BoundedTree.py
+""" Search tree with a fixed node budget, for memory-bounded A* (SMASTAR)
+
+Every node kept in memory is in the tree. When the budget is full the
+worst leaf (highest f, shallowest on ties) is evicted: it is dropped from
+its parent, and its f is remembered in the parent's Forgotten table, so
+the parent is expanded again (regenerating only the forgotten children)
+if that f ever becomes the best one left. The f values stay lower bounds
+of every path below a node, which keeps the search optimal.
+"""
+
+import heapq
+import math
+import sys
+from BoardClass import *
+
+class TreeNode():
+    """One board kept in a BoundedTree"""
+
+    __slots__ = ('Board', 'Parent', 'F', 'Kids', 'Forgotten', 'Expanded', 'Alive')
+
+    #=====================================================
+    def __init__(self, board: BoardClass, parent: 'TreeNode', f: float) -> None:
+        """Constructor; f: the node's (backed up) cost bound"""
+
+        self.Board = board
+        self.Parent = parent
+        self.F = f
+
+        # State -> TreeNode of the children in memory; State -> f of the evicted ones
+        self.Kids = {}
+        self.Forgotten = {}
+
+        self.Expanded = False
+        self.Alive = True
+
+    #=====================================================
+    def priority(self) -> float:
+        """Best f of what is left to generate below the node (inf if nothing is)"""
+
+        if not self.Expanded:
+            return self.F
+
+        return min(self.Forgotten.values(), default=math.inf)
+
+
+class BoundedTree():
+    """Tree of at most MaxNodes nodes with a best-first open list and worst-leaf eviction"""
+
+    #=====================================================
+    def __init__(self, root: BoardClass, maxNodes: int) -> None:
+        """Constructor: a tree holding just root"""
+
+        self.MaxNodes = max(2, maxNodes)
+        self.Count = 0
+        self.Evictions = 0
+
+        # tie breaker value: number of heap entries pushed so far
+        self.Pushes = 0
+
+        # (priority, -depth, n, node): lowest f first, deepest on ties
+        self.Open = []
+        # (-f, depth, n, node): highest f first, shallowest on ties
+        self.Leaves = []
+
+        self.Root = self.add(root, None, root.Cost)
+
+    #=====================================================
+    def add(self, board: BoardClass, parent: TreeNode, f: float) -> TreeNode:
+        """Put board in the tree under parent (the caller makes room first)"""
+
+        node = TreeNode(board, parent, f)
+        if parent is not None:
+            parent.Kids[board.State] = node
+        self.Count += 1
+
+        self.pushOpen(node)
+        self.pushLeaf(node)
+
+        return node
+
+    #=====================================================
+    def pushOpen(self, node: TreeNode) -> None:
+        """(Re)queue node for expansion at its current priority"""
+
+        priority = node.priority()
+        if priority != math.inf or not node.Expanded:
+            heapq.heappush(self.Open, (priority, -node.Board.PathLength, self.Pushes, node))
+            self.Pushes += 1
+
+    #=====================================================
+    def pushLeaf(self, node: TreeNode) -> None:
+        """(Re)queue a leaf for eviction at its current f"""
+
+        heapq.heappush(self.Leaves, (-node.F, node.Board.PathLength, self.Pushes, node))
+        self.Pushes += 1
+
+    #=====================================================
+    def popBest(self) -> TreeNode:
+        """Remove and return the node with the lowest priority (None if there is none)"""
+
+        while self.Open:
+            priority, depth, n, node = heapq.heappop(self.Open)
+            # skip entries made stale by an expansion or an eviction
+            if node.Alive and priority == node.priority():
+                return node
+
+        return None
+
+    #=====================================================
+    def full(self) -> bool:
+        """True if adding a node needs an eviction first"""
+
+        return self.Count >= self.MaxNodes
+
+    #=====================================================
+    def evictWorst(self, protect: TreeNode) -> bool:
+        """Evict the worst leaf (never the root or protect); returns False if no leaf can go"""
+
+        skipped = []
+        evicted = False
+        while self.Leaves:
+            entry = heapq.heappop(self.Leaves)
+            node = entry[3]
+            if not node.Alive or node.Kids or -entry[0] != node.F:
+                continue
+            if node is self.Root or node is protect:
+                skipped.append(entry)
+                continue
+
+            self.evict(node)
+            evicted = True
+            break
+
+        for entry in skipped:
+            heapq.heappush(self.Leaves, entry)
+
+        return evicted
+
+    #=====================================================
+    def evict(self, node: TreeNode) -> None:
+        """Drop a leaf, backing its f up into its parent's Forgotten table"""
+
+        node.Alive = False
+        self.Count -= 1
+        self.Evictions += 1
+
+        parent = node.Parent
+        state = node.Board.State
+        del parent.Kids[state]
+        parent.Forgotten[state] = min(parent.Forgotten.get(state, math.inf), node.F)
+
+        self.pushOpen(parent)
+        if not parent.Kids:
+            self.pushLeaf(parent)
+
+    #=====================================================
+    def backUp(self, node: TreeNode) -> None:
+        """Raise node's f (and its ancestors') to the best f of its children, once they're all known"""
+
+        while node is not None and node.Expanded:
+            best = min([kid.F for kid in node.Kids.values()] + list(node.Forgotten.values()),
+                       default=math.inf)
+            if best <= node.F:
+                return
+
+            node.F = best
+            if not node.Kids:
+                self.pushLeaf(node)
+            node = node.Parent
+
+
+#=====================================================
+def nodeBytes(board: BoardClass) -> int:
+    """Rough memory cost of one tree node (node, board, State and a kid entry)"""
+
+    node = TreeNode(board, None, 0)
+    return (sys.getsizeof(node) + sys.getsizeof(board) + sys.getsizeof(board.State)
+            + sys.getsizeof(node.Kids) + sys.getsizeof(node.Forgotten) + 64)
@@ -13,17 +13,33 @@ as heuristics.
 # this code is now finished (aws, 03/06/2025)
 """
 import timeit
-import queue
+import math
+import random
 from BoardClass import *
+from VisitedSet import VisitedSet, VISITED_SETS
+from OpenList import OPEN_LISTS
+from SearchResult import SearchResult, pathOf
+from SearchStats import openStats
+from SolutionWriter import SolutionWriter, solutionWriter
 
 #=====================================================
 def main() -> None:
     """Main function to run the 8-puzzle solver."""
 
+    from Heuristics import HEURISTICS
+    from SolutionCache import SolutionCache, CACHE_FILE, INFORMED
+
     
+    # board size menu
+    size = input("Enter the board width (3 = 8-puzzle, 4 = 15-puzzle, 5 = 24-puzzle) [3]: ")
+    if size.isdigit() and int(size) >= 2:
+        N = int(size)
+    else:
+        N = BoardClass.N
+
     # Create a new Board instance
     b = BoardClass()
-    b.initializePuzzleBoard()
+    b.initializePuzzleBoard(N)
 
     # print starting board
     print("\nStarting Board")
@@ -34,6 +50,12 @@ def main() -> None:
     print("1. A* Search")
     print("2. Best First Search")
     print("3. Depth First Search")
+    print("4. State Database Lookup (optimal, 8-puzzle only)")
+    print("5. Iterative Deepening A* Search")
+    print("6. Bidirectional A* Search")
+    print("7. Memory-Bounded A* Search (SMA*)")
+    print("8. Anytime Weighted A* Search (1 second deadline)")
+    print("9. Parallel Hash Distributed A* Search (HDA*, one process per core)")
     
     choice = input("Enter the number of your choice: ")
 
@@ -43,246 +65,281 @@ def main() -> None:
         alg = BestFS
     elif choice == '3':
         alg = DepthFS
+    elif choice == '4':
+        alg = DatabaseSearch
+    elif choice == '5':
+        alg = IDASTAR
+    elif choice == '6':
+        alg = BIDIRECTIONAL
+    elif choice == '7':
+        alg = SMASTAR
+    elif choice == '8':
+        alg = ANYTIME
+    elif choice == '9':
+        alg = HDASTAR
     else:
         print("Invalid choice. Defaulting to A* Search.")
         alg = ASTAR
 
-    # Run algorithm
-    if alg(b):
+    # heuristic menu (only the informed searches use one)
+    if alg.__name__ in INFORMED:
+        names = list(HEURISTICS)
+        print("\nChoose the heuristic:")
+        for i, name in enumerate(names):
+            print("%d. %s" % (i + 1, HEURISTICS[name].Description))
+
+        choice = input("Enter the number of your choice: ")
+
+        if choice.isdigit() and 1 <= int(choice) <= len(names):
+            BoardClass.useHeuristic(names[int(choice) - 1])
+        else:
+            print("Invalid choice. Defaulting to Manhattan Distance.")
+            BoardClass.useHeuristic('manhattan')
+
+        # re-score the starting board with the chosen heuristic
+        b.computeDistanceFromGoal()
+        b.Cost = b.Heuristic + b.PathLength
+
+    # output menu
+    print("\nShow the solution as:")
+    print("1. Boards")
+    print("2. Moves (U/R/D/L of the empty tile)")
+    print("3. JSON lines")
+
+    choice = input("Enter the number of your choice: ")
+
+    output = {'1': 'pretty', '2': 'moves', '3': 'json'}.get(choice, 'pretty')
+
+    # Run algorithm (boards solved before, by any run, come from the solution cache)
+    cache = SolutionCache(path=CACHE_FILE)
+    if cache.solve(b, alg.__name__, output=output):
         print("YES")
     else:
         print("DANG!")
+    print(cache)
+    cache.close()
     
 
     #Run algorithm comparison comment path printer
     #algComparer(3)
     #BFSvsASTAR(10)
+    #openListComparer(10)
 
 
 
 
 
 #=====================================================
-def ASTAR(startingBoard: BoardClass) -> bool:
+def useHeuristic(startingBoard: BoardClass, heuristic: str) -> None:
+    """Switch to the named heuristic (if any) and re-score the starting board; every
+    searcher's heuristic= is a Heuristics.HEURISTICS name, None keeps the current one"""
+
+    if heuristic is None: return
+
+    BoardClass.useHeuristic(heuristic)
+    startingBoard.computeDistanceFromGoal()
+    startingBoard.Cost = startingBoard.Heuristic + startingBoard.PathLength
+
+
+#=====================================================
+def ASTAR(startingBoard: BoardClass, heuristic: str = None, openList: str = 'bucket',
+          visited: str = 'hash', statsFile: str = "resultsASTAR.csv",
+          output: SolutionWriter = None) -> SearchResult:
     """Solves 8puzzle by A* Search and print the path to console and stats to a csv file"""
 
-    # Open csv and write header
-    FOUT = open("resultsASTAR.csv", 'w')
-    FOUT.write("ASTAR Search Stats\n")
-    FOUT.write("Board Number, Queue Size, Visted List Size, Time(milliseconds)\n")
+    useHeuristic(startingBoard, heuristic)
+
+    # Stats (sampled into a buffer, written out when the search ends)
+    stats = openStats(statsFile, "ASTAR Search Stats",
+                      [("Board Number", "%d"), ("Queue Size", "%d"), ("Visted List Size", "%d"), ("Duplicates Skipped", "%d")])
     
     
-    # Create a PriorityQueue instance
-    # each item PUSHED (put) onto the Queue will be a tuple:  (TotalCostScore, tieBreakerValue, theNode)
-    Q = queue.PriorityQueue()	
-    # tie breaker value/ board number
-    numberOfItemsAddedToQueue = 0
+    # Create an open list (priority queue) instance
+    # each board PUSHED onto the Queue is prioritized by its TotalCostScore
+    Q = OPEN_LISTS[openList]()
 
-    # Push the starting board onto the empty queue and visited list
-    Q.put( (startingBoard.Cost, numberOfItemsAddedToQueue, startingBoard) )
-    numberOfItemsAddedToQueue += 1
-    visited = [startingBoard]
+    # Push the starting board onto the empty queue (it is marked visited once popped)
+    Q.push(startingBoard.Cost, startingBoard)
+    visited = VISITED_SETS[visited](startingBoard.Size)
 
     # helper variables
     foundSolution = False
+    goalNode = None
     nextTry = 0
     maxQueueSize = 0
 
     # start the timer
     startTime = timeit.default_timer()
 
-    while not Q.empty():
-        # check timer write stats to csv
-        elapsedTime = timeit.default_timer() - startTime
-        FOUT.write("%d,%d,%d,%.12f\n" % (nextTry, Q.qsize(), len(visited), elapsedTime*1000))
+    while Q:
+        # sample stats
+        if nextTry >= stats.Next: stats.record(nextTry, len(Q), len(visited), visited.Duplicates)
         
         # Track max queue size
-        maxQueueSize = max(maxQueueSize, Q.qsize())
+        maxQueueSize = max(maxQueueSize, len(Q))
 
         # Get the node with the lowest Cost score
-        currentCost, tieBreaker, currentNode = Q.get()
+        currentCost, currentNode = Q.pop()
 
         # Check if the current node has been visited before
-        for board in visited:
-            if currentNode.sameBoard(board): continue
+        if visited.seen(currentNode): continue
 
         # not visited? visit it
-        visited.append(currentNode)
+        visited.add(currentNode)
 
         # Check if the current node is the goal
         if currentNode.isGoal():
             foundSolution = True
+            goalNode = currentNode
             print("ASTAR: Solution found!")
             
-            # Trace back the path from the goal to the start
-            print("Path: \n")
-            stack = []
-            while currentNode:
-                stack.append(currentNode)
-                currentNode = currentNode.Parent
-            while stack:
-                board = stack.pop()
-                print(str(board) + "\n")
+            # Stream the path from the start
+            solutionWriter(output).write(startingBoard, pathOf(goalNode), "ASTAR")
             
              
-            FOUT.write("Max Queue Size: %d\n" % maxQueueSize)
+            stats.summarize("Max Queue Size", maxQueueSize)
+            stats.summarize("Duplicates Skipped", visited.Duplicates)
             print("ASTAR: Max Queue Size: %d\n" % maxQueueSize)
 
-            FOUT.close()
-            return foundSolution
+            stats.flush()
+            return SearchResult("ASTAR", pathOf(goalNode), nextTry, maxQueueSize, visited.Duplicates, timeit.default_timer() - startTime)
 
         # Generate Children
         children = currentNode.createChildrenBoards()
 
-        # check if children is in visited list, if not add to queue, else skip
+        # check if children is in visited set, if not add to queue, else skip
         for child in children:
-            isVisited = False
-            for board in visited:
-                if child.sameBoard(board):
-                    isVisited = True
-                    break
-
-            if not isVisited:
-                Q.put((child.Cost, numberOfItemsAddedToQueue, child))
-                numberOfItemsAddedToQueue += 1
+            if not visited.seen(child):
+                Q.push(child.Cost, child)
                 
         # Progress counter/ program stopper
         nextTry += 1
         if nextTry >= 10000:
             print("ASTAR is bad... giving up")
-            FOUT.write("Max Queue Size: %d\n" % maxQueueSize)
+            stats.summarize("Max Queue Size", maxQueueSize)
+            stats.summarize("Duplicates Skipped", visited.Duplicates)
             print("ASTAR: Max Queue Size: %d\n" % maxQueueSize)
-            FOUT.close()
+            stats.flush()
 
-            return foundSolution
+            return SearchResult("ASTAR", pathOf(goalNode), nextTry, maxQueueSize, visited.Duplicates, timeit.default_timer() - startTime)
         if nextTry % 1000 == 0:
             print(f"ASTAR still searching... {nextTry} boards explored")
 
 
     # code broken?!?
     print("No Solution ... ???")
-    FOUT.close()
+    stats.flush()
 
-    return foundSolution
+    return SearchResult("ASTAR", pathOf(goalNode), nextTry, maxQueueSize, visited.Duplicates, timeit.default_timer() - startTime)
 
 
 #=====================================================
-def BestFS(startingBoard: BoardClass) -> bool:
+def BestFS(startingBoard: BoardClass, heuristic: str = None, openList: str = 'bucket',
+           visited: str = 'hash', statsFile: str = "resultsBFS.csv",
+           output: SolutionWriter = None) -> SearchResult:
     """Solve 8puzzle by Best First Search and print the path to console and stats to a csv file"""
 
-    # Open csv and write header
-    FOUT = open("resultsBFS.csv", 'w')
-    FOUT.write("Best First Search Stats\n")
-    FOUT.write("Board Number, Queue Size, Visted List Size, Time(milliseconds)\n")
+    useHeuristic(startingBoard, heuristic)
+
+    # Stats (sampled into a buffer, written out when the search ends)
+    stats = openStats(statsFile, "Best First Search Stats",
+                      [("Board Number", "%d"), ("Queue Size", "%d"), ("Visted List Size", "%d"), ("Duplicates Skipped", "%d")])
     
-    # Create a PriorityQueue instance
-    # each item PUSHED (put) onto the Queue will be a tuple:  (heuristicScore, tieBreakerValue, theNode)
-    Q = queue.PriorityQueue()	
-    numberOfItemsAddedToQueue = 0
+    # Create an open list (priority queue) instance
+    # each board PUSHED onto the Queue is prioritized by its heuristicScore
+    Q = OPEN_LISTS[openList]()
 
-    # Push the starting board onto the empty queue and visited list
-    Q.put( (startingBoard.Heuristic, numberOfItemsAddedToQueue, startingBoard) )
-    numberOfItemsAddedToQueue += 1
-    visited = [startingBoard]
+    # Push the starting board onto the empty queue (it is marked visited once popped)
+    Q.push(startingBoard.Heuristic, startingBoard)
+    visited = VISITED_SETS[visited](startingBoard.Size)
 
     # helper variables
     foundSolution = False
+    goalNode = None
     nextTry = 0
     maxQueueSize = 0
 
     # start the timer
     startTime = timeit.default_timer()
 
-    while not Q.empty():
-        # check timer write stats to csv
-        elapsedTime = timeit.default_timer() - startTime
-        FOUT.write("%d,%d,%d,%.12f\n" % (nextTry, Q.qsize(), len(visited), elapsedTime*1000))
+    while Q:
+        # sample stats
+        if nextTry >= stats.Next: stats.record(nextTry, len(Q), len(visited), visited.Duplicates)
 
         # Track max queue size
-        maxQueueSize = max(maxQueueSize, Q.qsize())
+        maxQueueSize = max(maxQueueSize, len(Q))
 
         # Get the node with the lowest heuristic score
-        currentHeuristic, tieBreaker, currentNode = Q.get()
+        currentHeuristic, currentNode = Q.pop()
 
         # Check if the current node has been visited before
-        for board in visited:
-            if currentNode.sameBoard(board): continue
+        if visited.seen(currentNode): continue
 
         # not visited? visit it
-        visited.append(currentNode)
+        visited.add(currentNode)
 
         # Check if the current node is the goal
         if currentNode.isGoal():
             foundSolution = True
+            goalNode = currentNode
             print("BFS: Solution found!")
             
-            # Trace back the path from the goal to the start
-            print("Path: \n")
-            stack = []
-            while currentNode:
-                stack.append(currentNode)
-                currentNode = currentNode.Parent
-            while stack:
-                board = stack.pop()
-                print(str(board) + "\n")
+            # Stream the path from the start
+            solutionWriter(output).write(startingBoard, pathOf(goalNode), "BestFS")
             
-            FOUT.write("Max Queue Size: %d\n" % maxQueueSize)
+            stats.summarize("Max Queue Size", maxQueueSize)
+            stats.summarize("Duplicates Skipped", visited.Duplicates)
             print("BFS: Max Queue Size: %d\n" % maxQueueSize)
 
-            FOUT.close()
-            return foundSolution
+            stats.flush()
+            return SearchResult("BestFS", pathOf(goalNode), nextTry, maxQueueSize, visited.Duplicates, timeit.default_timer() - startTime, math.inf)
 
         # Generate Children
         children = currentNode.createChildrenBoards()
 
-        # check if children is in visited list, if not add to queue, else skip
+        # check if children is in visited set, if not add to queue, else skip
         for child in children:
-            isVisited = False
-            for board in visited:
-                if child.sameBoard(board):
-                    isVisited = True
-                    break
-
-            if not isVisited:
-                Q.put((child.Heuristic, numberOfItemsAddedToQueue, child))
-                numberOfItemsAddedToQueue += 1
+            if not visited.seen(child):
+                Q.push(child.Heuristic, child)
 
         # Progress counter/ program stopper
         nextTry += 1
         if nextTry >= 10000:
             print("BFS is bad... giving up")
-            FOUT.write("Max Queue Size: %d\n" % maxQueueSize)
+            stats.summarize("Max Queue Size", maxQueueSize)
+            stats.summarize("Duplicates Skipped", visited.Duplicates)
             print("BFS: Max Queue Size: %d\n" % maxQueueSize)
-            FOUT.close()
+            stats.flush()
 
-            return foundSolution
+            return SearchResult("BestFS", pathOf(goalNode), nextTry, maxQueueSize, visited.Duplicates, timeit.default_timer() - startTime, math.inf)
         if nextTry % 1000 == 0:
             print(f"BFS still searching... {nextTry} boards explored")
 
 
     # code broken?!?
     print("No Solution ... ???")
-    FOUT.close()
+    stats.flush()
 
-    return foundSolution
+    return SearchResult("BestFS", pathOf(goalNode), nextTry, maxQueueSize, visited.Duplicates, timeit.default_timer() - startTime, math.inf)
 
 
 #=====================================================
-def DepthFS(startingBoard: BoardClass) -> bool:
+def DepthFS(startingBoard: BoardClass, visited: str = 'hash', statsFile: str = "resultsDFS.csv",
+            output: SolutionWriter = None) -> SearchResult:
     """Solve 8puzzle by DFS(up, right, down, left) and print the path to console and stats to a csv file"""
 
-    # Open csv and write header
-    FOUT = open("resultsDFS.csv", 'w')
-    FOUT.write("Depth First Search Stats\n")
-    FOUT.write("Board Number, Stack Size, Visted List Size, Time(milliseconds)\n")
+    # Stats (sampled into a buffer, written out when the search ends)
+    stats = openStats(statsFile, "Depth First Search Stats",
+                      [("Board Number", "%d"), ("Stack Size", "%d"), ("Visted List Size", "%d"), ("Duplicates Skipped", "%d")])
 
-    # Create a stack/ visted list and push the starting board onto it
+    # Create a stack/ visted set and push the starting board onto it
     stack = []
     stack.append(startingBoard)
-    visited = [startingBoard]
+    visited = VISITED_SETS[visited](startingBoard.Size)
 
     # helper variables
     foundSolution = False
+    goalNode = None
     nextTry = 0
     maxStackSize = 0
 
@@ -290,9 +347,8 @@ def DepthFS(startingBoard: BoardClass) -> bool:
     startTime = timeit.default_timer()
 
     while stack:
-        # check timer write stats to csv
-        elapsedTime = timeit.default_timer() - startTime
-        FOUT.write("%d,%d,%d,%.12f\n" % (nextTry, len(stack), len(visited), elapsedTime*1000))
+        # sample stats
+        if nextTry >= stats.Next: stats.record(nextTry, len(stack), len(visited), visited.Duplicates)
 
         # Track max stack size
         maxStackSize = max(maxStackSize, len(stack))
@@ -301,74 +357,567 @@ def DepthFS(startingBoard: BoardClass) -> bool:
         currentNode = stack.pop()
 
         # Check if the current node has been visited before
-        for board in visited:
-            if currentNode.sameBoard(board): continue
+        if visited.seen(currentNode): continue
 
         # not visited? visit it
-        visited.append(currentNode)
+        visited.add(currentNode)
 
         # Check if the current node is the goal
         if currentNode.isGoal():
             foundSolution = True
+            goalNode = currentNode
             print("DFS: Solution found!")
             
-            # Trace back the path from the goal to the start
-            print("Path: \n")
-            path = []
-            while currentNode:
-                path.append(currentNode)
-                currentNode = currentNode.Parent
-            while path:
-                board = path.pop()
-                print(str(board) + "\n")
+            # Stream the path from the start
+            solutionWriter(output).write(startingBoard, pathOf(goalNode), "DepthFS")
             
-            FOUT.write("Max Stack Size: %d\n" % maxStackSize)
+            stats.summarize("Max Stack Size", maxStackSize)
+            stats.summarize("Duplicates Skipped", visited.Duplicates)
             print("DFS: Max Stack Size: %d\n" % maxStackSize)
             
-            FOUT.close()
-            return foundSolution
+            stats.flush()
+            return SearchResult("DepthFS", pathOf(goalNode), nextTry, maxStackSize, visited.Duplicates, timeit.default_timer() - startTime, math.inf)
 
         # Generate Children
         children = currentNode.createChildrenBoards()
 
-        # check if children is in visited list, if not add to stack, else skip
+        # check if children is in visited set, if not add to stack, else skip
         for child in children:
-            isVisited = False
-            for board in visited:
-                if child.sameBoard(board):
-                    isVisited = True
-                    break
-
-            if not isVisited:
+            if not visited.seen(child):
                 stack.append(child)
 
         # Progress counter/ program stopper
         nextTry += 1
         if nextTry >= 10000:
             print("DFS is bad... giving up")
-            FOUT.write("Max Stack Size: %d\n" % maxStackSize)
+            stats.summarize("Max Stack Size", maxStackSize)
+            stats.summarize("Duplicates Skipped", visited.Duplicates)
             print("DFS: Max Stack Size: %d\n" % maxStackSize)
-            FOUT.close()
+            stats.flush()
 
-            return foundSolution
+            return SearchResult("DepthFS", pathOf(goalNode), nextTry, maxStackSize, visited.Duplicates, timeit.default_timer() - startTime, math.inf)
         if nextTry % 1000 == 0:
             print(f"DFS still searching... {nextTry} boards explored")
 
     # code broken?!?
     print("No Solution ... ???")
-    FOUT.close()
+    stats.flush()
+
+    return SearchResult("DepthFS", pathOf(goalNode), nextTry, maxStackSize, visited.Duplicates, timeit.default_timer() - startTime, math.inf)
+
+
+#=====================================================
+def IDASTAR(startingBoard: BoardClass, heuristic: str = None, deadline: float = None,
+            statsFile: str = "resultsIDASTAR.csv", output: SolutionWriter = None) -> SearchResult:
+    """Solve 8puzzle by Iterative Deepening A* and print the path to console and stats to a csv file"""
+
+    useHeuristic(startingBoard, heuristic)
+
+    # Stats (sampled into a buffer, written out when the search ends)
+    stats = openStats(statsFile, "IDASTAR Search Stats",
+                      [("Iteration", "%d"), ("Cost Bound", "%d"), ("Boards Explored", "%d")])
+
+    # the one board that gets searched, and the cells the empty tile moved to from the start
+    board = startingBoard.copyCTOR()
+    path = []
+
+    # helper variables
+    foundSolution = False
+    nextTry = 0
+    iteration = 0
+    bound = board.Heuristic
+
+    # start the timer
+    startTime = timeit.default_timer()
+    endTime = startTime + deadline if deadline is not None else None
+
+    # an unsolvable board would deepen the bound forever
+    if not startingBoard.isSolvable():
+        print("IDASTAR: board can't reach the GOAL")
+        stats.flush()
+        return SearchResult("IDASTAR", None, 0, 0, 0, timeit.default_timer() - startTime)
+
+    while bound != math.inf:
+        # depth first search every board with Cost <= bound
+        searchedBound = bound
+        bound, explored = idaSearch(board, 0, searchedBound, -1, path, endTime)
+        nextTry += explored
+
+        if bound == GAVE_UP:
+            print("IDASTAR: no solution within the %g second deadline" % deadline)
+            break
+
+        # sample stats
+        if iteration >= stats.Next: stats.record(iteration, searchedBound, nextTry)
+        iteration += 1
+
+        if bound == FOUND:
+            foundSolution = True
+            print("IDASTAR: Solution found!")
+
+            # Stream the path from the start
+            solutionWriter(output).write(startingBoard, path, "IDASTAR")
+
+            print("IDASTAR: Boards Explored: %d\n" % nextTry)
+
+            stats.flush()
+            return SearchResult("IDASTAR", path if foundSolution else None, nextTry, len(path), 0, timeit.default_timer() - startTime)
 
-    return foundSolution
+        print(f"IDASTAR still searching... {nextTry} boards explored, raising bound to {bound}")
 
+    if bound != GAVE_UP:
+        # code broken?!?
+        print("No Solution ... ???")
+    stats.flush()
+
+    return SearchResult("IDASTAR", path if foundSolution else None, nextTry, len(path), 0, timeit.default_timer() - startTime)
+
+
+# idaSearch() result when the GOAL was reached, and when the deadline passed
+FOUND = -1
+GAVE_UP = -2
+
+#=====================================================
+def idaSearch(board: BoardClass, pathLength: int, bound: int, previousBlank: int, path: list[int],
+              endTime: float = None) -> tuple:
+    """Depth first search from board of every board with Cost <= bound. Returns
+    (FOUND, GAVE_UP (past endTime, a timeit.default_timer() value) or the smallest
+    Cost over the bound, number of boards explored);
+    on FOUND board is left at the GOAL and path holds the moves to it"""
+
+    cost = pathLength + board.Heuristic
+    if cost > bound: return cost, 0
+    if board.isGoal(): return FOUND, 1
+    if endTime is not None and timeit.default_timer() >= endTime: return GAVE_UP, 1
+
+    explored = 1
+    smallest = math.inf
+    blank = board.Blank
+
+    for target in board.neighborCells():
+        # never slide straight back to the parent board
+        if target == previousBlank: continue
+
+        board.moveBlank(target)
+        path.append(target)
+
+        result, count = idaSearch(board, pathLength + 1, bound, blank, path, endTime)
+        explored += count
+        if result == FOUND or result == GAVE_UP: return result, explored
+
+        # undo the move
+        path.pop()
+        board.moveBlank(blank)
+
+        smallest = min(smallest, result)
+
+    return smallest, explored
+
+
+# BoardSizes whose GOAL is a recent BIDIRECTIONAL starting board, (N, State) -> BoardSize,
+# least recently used first: their heuristic tables (a pattern database, say) are built once
+BACKWARD_SIZES = {}
+BACKWARD_SIZES_KEPT = 16
+
+#=====================================================
+def backwardSize(startingBoard: BoardClass) -> BoardSize:
+    """BoardSize whose GOAL is startingBoard, using the current heuristic (cached, see BACKWARD_SIZES)"""
+
+    # (a dict keeps insertion order: taking an entry out and back in makes it the most recent)
+    key = (startingBoard.Size.N, startingBoard.State)
+    size = BACKWARD_SIZES.pop(key, None)
+    if size is None:
+        size = BoardSize(startingBoard.Size.N, startingBoard.Board)
+        while len(BACKWARD_SIZES) >= BACKWARD_SIZES_KEPT:
+            del BACKWARD_SIZES[next(iter(BACKWARD_SIZES))]
+    else:
+        size.useHeuristic(BoardClass.HeuristicName)
+    BACKWARD_SIZES[key] = size
+
+    return size
 
 #=====================================================
-def algComparer(numTrials: int) -> None:
-    """Run the 8-puzzle solver using all three algorithms and compare the run times."""
+def BIDIRECTIONAL(startingBoard: BoardClass, heuristic: str = None, informed: bool = True,
+                  statsFile: str = "resultsBIDIR.csv", output: SolutionWriter = None) -> SearchResult:
+    """Solve 8puzzle by searching forward from the start and backward from the GOAL until the frontiers meet"""
+
+    useHeuristic(startingBoard, heuristic)
+
+    # Stats (sampled into a buffer, written out when the search ends)
+    stats = openStats(statsFile, "Bidirectional Search Stats",
+                      [("Board Number", "%d"), ("Forward Queue Size", "%d"), ("Backward Queue Size", "%d"), ("Forward Visited Size", "%d"), ("Backward Visited Size", "%d"), ("Best Meeting Cost", "%g")])
+
+    # the backward search runs on boards whose "GOAL" (and heuristic) is the starting board
+    goalBoard = BoardClass.fromState(startingBoard.Size.GoalState, startingBoard.Size.N)
+    goalBoard.Size = backwardSize(startingBoard)
+    goalBoard.computeDistanceFromGoal()
+
+    # one open list, best board per State (hash indexed frontier) and visited set per direction
+    forward = (OPEN_LISTS['bucket'](), {startingBoard.State: startingBoard}, VisitedSet())
+    backward = (OPEN_LISTS['bucket'](), {goalBoard.State: goalBoard}, VisitedSet())
+    forward[0].push(startingBoard.Heuristic if informed else 0, startingBoard)
+    backward[0].push(goalBoard.Heuristic if informed else 0, goalBoard)
+
+    # helper variables
+    foundSolution = False
+    nextTry = 0
+    maxQueueSize = 0
+    # cost of the best meeting found so far and the forward/backward boards it joins
+    bestCost = math.inf
+    meeting = None
+    # lowest cost any solution can have (bestCost once the stop condition proves it optimal)
+    lowerBound = 0
+    if startingBoard.isGoal():
+        bestCost = 0
+        meeting = (startingBoard, goalBoard)
+
+    # start the timer
+    startTime = timeit.default_timer()
+
+    while forward[0] and backward[0]:
+        # sample stats
+        if nextTry >= stats.Next: stats.record(nextTry, len(forward[0]), len(backward[0]), len(forward[2]), len(backward[2]), bestCost)
+
+        # Track max queue size
+        maxQueueSize = max(maxQueueSize, len(forward[0]) + len(backward[0]))
+
+        # stop once no unexpanded board can lead to a cheaper meeting
+        lowestForward = forward[0].peek()
+        lowestBackward = backward[0].peek()
+        lowerBound = max(lowestForward, lowestBackward) if informed else lowestForward + lowestBackward
+        if bestCost <= lowerBound:
+            lowerBound = bestCost
+            break
+
+        # expand the direction with the smaller frontier
+        if len(forward[0]) <= len(backward[0]):
+            (Q, reached, visited), (_, otherReached, _) = forward, backward
+        else:
+            (Q, reached, visited), (_, otherReached, _) = backward, forward
+
+        currentCost, currentNode = Q.pop()
+
+        # Check if the current node has been visited before
+        if visited.seen(currentNode): continue
+
+        # not visited? visit it
+        visited.add(currentNode)
+
+        # Generate Children
+        for child in currentNode.createChildrenBoards():
+            best = reached.get(child.State)
+            if best is not None and best.PathLength <= child.PathLength:
+                visited.Duplicates += 1
+                continue
+            reached[child.State] = child
+            Q.push(child.Cost if informed else child.PathLength, child)
+
+            # did the frontiers meet?
+            other = otherReached.get(child.State)
+            if other is not None and child.PathLength + other.PathLength < bestCost:
+                bestCost = child.PathLength + other.PathLength
+                meeting = (child, other) if reached is forward[1] else (other, child)
+
+        # Progress counter/ program stopper
+        nextTry += 1
+        if nextTry >= 10000:
+            print("BIDIRECTIONAL is bad... giving up")
+            break
+        if nextTry % 1000 == 0:
+            print(f"BIDIRECTIONAL still searching... {nextTry} boards explored")
+
+    # a frontier ran out: every board on that side was expanded, so the best meeting is optimal
+    if not (forward[0] and backward[0]):
+        lowerBound = bestCost
+
+    path = None
+    bound = math.inf
+    if meeting is not None:
+        foundSolution = True
+        # given up before the stop condition fired: the meeting is only as good as the open lists prove
+        bound = 1.0 if bestCost == lowerBound else (bestCost / lowerBound if lowerBound > 0 else math.inf)
+        print("BIDIRECTIONAL: Solution found!" if bound == 1.0 else "BIDIRECTIONAL: Solution found (not proven optimal)")
+
+        # join the two Parent chains: start -> meeting board, then meeting board -> GOAL
+        forwardNode, backwardNode = meeting
+        path = pathOf(forwardNode)
+        while backwardNode.Parent is not None:
+            backwardNode = backwardNode.Parent
+            path.append(backwardNode.Blank)
+
+        # Stream the path from the start
+        solutionWriter(output).write(startingBoard, path, "BIDIRECTIONAL")
+
+    stats.summarize("Max Queue Size", maxQueueSize)
+    stats.summarize("Duplicates Skipped", (forward[2].Duplicates + backward[2].Duplicates))
+    print("BIDIRECTIONAL: Max Queue Size: %d\n" % maxQueueSize)
+    stats.flush()
+
+    return SearchResult("BIDIRECTIONAL", path, nextTry, maxQueueSize, forward[2].Duplicates + backward[2].Duplicates,
+                        timeit.default_timer() - startTime, bound)
+
+
+#=====================================================
+def SMASTAR(startingBoard: BoardClass, heuristic: str = None, maxNodes: int = 10000,
+            maxBytes: int = None, deadline: float = None, statsFile: str = "resultsSMASTAR.csv",
+            output: SolutionWriter = None) -> SearchResult:
+    """Solve 8puzzle by memory-bounded A* (SMA*) and print the path to console and stats to a csv file"""
+
+    from BoundedTree import BoundedTree, nodeBytes
+
+    useHeuristic(startingBoard, heuristic)
+
+    # Stats (sampled into a buffer, written out when the search ends)
+    stats = openStats(statsFile, "SMASTAR Search Stats",
+                      [("Board Number", "%d"), ("Nodes In Memory", "%d"), ("Nodes Evicted", "%d")])
+
+    if maxBytes is not None:
+        maxNodes = maxBytes // nodeBytes(startingBoard)
+
+    # tree of the boards kept in memory
+    tree = BoundedTree(startingBoard, maxNodes)
+
+    # helper variables
+    goalNode = None
+    nextTry = 0
+
+    # start the timer
+    startTime = timeit.default_timer()
+
+    while True:
+        # sample stats
+        if nextTry >= stats.Next: stats.record(nextTry, tree.Count, tree.Evictions)
+
+        if deadline is not None and timeit.default_timer() - startTime >= deadline:
+            print("SMASTAR: no solution within the %g second deadline" % deadline)
+            break
+
+        # Get the node with the lowest cost bound
+        node = tree.popBest()
+        if node is None or node.priority() == math.inf:
+            # the GOAL is deeper than the budget lets a path grow
+            print("SMASTAR: no solution fits in %d boards" % tree.MaxNodes)
+            break
+
+        currentNode = node.Board
+        if currentNode.isGoal():
+            goalNode = currentNode
+            print("SMASTAR: Solution found!")
+
+            # Stream the path from the start
+            solutionWriter(output).write(startingBoard, pathOf(goalNode), "SMASTAR")
+
+            stats.summarize("Max Nodes", tree.MaxNodes)
+            stats.summarize("Nodes Evicted", tree.Evictions)
+            print("SMASTAR: Nodes Evicted: %d\n" % tree.Evictions)
+            break
+
+        # Generate the children that aren't in memory (all of them the first time, else the evicted ones)
+        previous = currentNode.Parent.State if currentNode.Parent is not None else None
+        for child in currentNode.createChildrenBoards():
+            if child.State == previous or child.State in node.Kids: continue
+            if node.Expanded and child.State not in node.Forgotten: continue
+
+            # a child's cost is never below its parent's, nor below what it had when evicted
+            f = max(child.Cost, node.F, node.Forgotten.pop(child.State, 0))
+            if child.PathLength >= tree.MaxNodes - 1 and not child.isGoal():
+                # no room for a path past this board
+                f = math.inf
+
+            if tree.full() and not tree.evictWorst(node):
+                node.Forgotten[child.State] = f
+                continue
+            tree.add(child, node, f)
+
+        node.Expanded = True
+        tree.backUp(node)
+        tree.pushOpen(node)
+
+        # Progress counter
+        nextTry += 1
+        if nextTry % 1000 == 0:
+            print(f"SMASTAR still searching... {nextTry} boards explored, {tree.Evictions} evicted")
+
+    stats.flush()
+
+    return SearchResult("SMASTAR", pathOf(goalNode), nextTry, tree.Count, 0, timeit.default_timer() - startTime)
+
+
+#=====================================================
+def ANYTIME(startingBoard: BoardClass, heuristic: str = None, deadline: float = 1.0, weight: float = 3.0,
+            weightStep: float = 0.5, statsFile: str = "resultsANYTIME.csv",
+            output: SolutionWriter = None) -> SearchResult:
+    """Solve 8puzzle by anytime weighted A* within deadline seconds, returning the best solution found"""
+
+    # Stats (sampled into a buffer, written out when the search ends)
+    stats = openStats(statsFile, "ANYTIME Search Stats",
+                      [("Solution Number", "%d"), ("Boards Explored", "%d"), ("Moves", "%d"), ("Bound", "%g")])
+
+    result = SearchResult("ANYTIME", None, 0, 0, 0, 0.0)
+    solutions = 0
+    for result in anytimeSearch(startingBoard, heuristic, deadline, weight, weightStep):
+        print("ANYTIME: %d moves after %.3fms (at most %.3f times optimal)" % (result.Moves, result.Time * 1000, result.Bound))
+        if solutions >= stats.Next: stats.record(solutions, result.Explored, result.Moves, result.Bound)
+        solutions += 1
+
+    if result.Solved:
+        print("ANYTIME: Solution found!")
+
+        # Stream the path from the start
+        solutionWriter(output).write(startingBoard, result.Path, "ANYTIME")
+    else:
+        print("ANYTIME: no solution before the deadline")
+
+    stats.summarize("Solutions Found", solutions)
+    stats.flush()
+
+    return result
+
+#=====================================================
+def anytimeSearch(startingBoard: BoardClass, heuristic: str = None, deadline: float = 1.0,
+                  weight: float = 3.0, weightStep: float = 0.5):
+    """Anytime Repairing A* (ARA*): yields a SearchResult for every better solution found
+    before deadline seconds have passed. Starts with the greedy f = g + weight*h, then
+    lowers weight by weightStep (down to 1, optimal) after each solution, reusing what
+    was already searched: boards whose cost improved after they were expanded are
+    queued again instead of searching from scratch. Each result carries its Bound"""
+
+    useHeuristic(startingBoard, heuristic)
+
+    # start the timer
+    startTime = timeit.default_timer()
+    endTime = startTime + deadline
+
+    # best board (lowest PathLength) found so far per State
+    best = {startingBoard.State: startingBoard}
+    Q = OPEN_LISTS['heap']()
+    Q.push(startingBoard.PathLength + weight * startingBoard.Heuristic, startingBoard)
+    # expanded this round, and expanded boards whose PathLength improved since (inconsistent)
+    closed = set()
+    incons = set()
+
+    # helper variables
+    goalState = startingBoard.Size.GoalState
+    nextTry = 0
+    maxQueueSize = 0
+    duplicates = 0
+    bestMoves = math.inf
+    bestBound = math.inf
+
+    while True:
+        # improve the path with the current weight: expand while a board could beat the GOAL's cost
+        while Q and timeit.default_timer() < endTime:
+            goal = best.get(goalState)
+            if goal is not None and goal.PathLength <= Q.peek():
+                break
+
+            maxQueueSize = max(maxQueueSize, len(Q))
+            currentCost, currentNode = Q.pop()
+            closed.add(currentNode.State)
+            nextTry += 1
+
+            for child in currentNode.createChildrenBoards():
+                known = best.get(child.State)
+                if known is not None and known.PathLength <= child.PathLength:
+                    duplicates += 1
+                    continue
+
+                best[child.State] = child
+                if child.State in closed:
+                    incons.add(child.State)
+                else:
+                    Q.push(child.PathLength + weight * child.Heuristic, child)
+
+        goal = best.get(goalState)
+        if goal is None:
+            return
+
+        # suboptimality bound: the GOAL's cost over the lowest f (weight 1) still open
+        lowest = min([best[state].Cost for state in list(Q.Best) + list(incons)], default=goal.PathLength)
+        bound = max(1.0, min(weight, goal.PathLength / lowest)) if lowest > 0 else weight
+        if goal.PathLength < bestMoves or bound < bestBound:
+            bestMoves = goal.PathLength
+            bestBound = bound
+            yield SearchResult("ANYTIME", pathOf(goal), nextTry, maxQueueSize, duplicates,
+                               timeit.default_timer() - startTime, bound)
+
+        if bound <= 1.0 or timeit.default_timer() >= endTime:
+            return
+
+        # lower the weight and requeue the open and inconsistent boards with it
+        weight = max(1.0, weight - weightStep)
+        states = list(Q.Best) + list(incons)
+        Q = OPEN_LISTS['heap']()
+        for state in states:
+            board = best[state]
+            Q.push(board.PathLength + weight * board.Heuristic, board)
+        closed = set()
+        incons = set()
+
+
+#=====================================================
+def HDASTAR(startingBoard: BoardClass, **kwargs) -> SearchResult:
+    """Solve by hash distributed A* on several processes (ParallelSearch.HDASTAR, same kwargs);
+    imported on first use, so multiprocessing isn't loaded for the other searchers"""
+
+    from ParallelSearch import HDASTAR as search
+    return search(startingBoard, **kwargs)
+
+
+#=====================================================
+def DatabaseSearch(startingBoard: BoardClass, statsFile: str = None, output: SolutionWriter = None) -> SearchResult:
+    """Solve 8puzzle optimally by descending the precomputed StateDatabase and print the path to console"""
+
+    # (statsFile is unused: there are no stats to keep, but every searcher takes it)
+
+    # start the timer
+    startTime = timeit.default_timer()
+
+    if startingBoard.Size.N != 3:
+        print("DB: the state database only covers the 8-puzzle")
+        return SearchResult("DatabaseSearch", None, 0, 0, 0, timeit.default_timer() - startTime)
+
+    from StateDatabase import StateDatabase
+
+    database = StateDatabase()
+    goalBoard = database.solve(startingBoard)
+    database.close()
+
+    if goalBoard is None:
+        print("DB: board is not solvable")
+        return SearchResult("DatabaseSearch", None, 0, 0, 0, timeit.default_timer() - startTime)
+
+    print("DB: Solution found!")
+
+    # Stream the path from the start
+    solutionWriter(output).write(startingBoard, pathOf(goalBoard), "DatabaseSearch")
+
+    print("DB: Moves: %d\n" % goalBoard.PathLength)
+
+    return SearchResult("DatabaseSearch", pathOf(goalBoard), goalBoard.PathLength, 0, 0, timeit.default_timer() - startTime)
+
+
+#=====================================================
+def seedBoards(seed: int) -> None:
+    """Seed the random boards made by initializePuzzleBoard() (None leaves them random)"""
+
+    if seed is None: return
+
+    random.seed(seed)
+
+
+#=====================================================
+def algComparer(numTrials: int, seed: int = None) -> None:
+    """Run the 8-puzzle solver using all four search algorithms and compare the run times.
+    (each trial's search stats go to their own results<ALG>_<trial>.csv; seed: repeat the
+    same boards every run. See Benchmark.py for median/p95 timings and baselines)"""
+
+    seedBoards(seed)
 
     # Open csv and write header
     FOUT1 = open("RunTimes.csv", 'w')
     FOUT1.write("Run Time(milliseconds) - Algorithm Comparison\n")
-    FOUT1.write("Trial Number, ASTAR(time, outcome), BestFS(time, outcome), DepthFS(time, outcome)\n")
+    FOUT1.write("Trial Number, ASTAR(time, outcome), BestFS(time, outcome), DepthFS(time, outcome), IDASTAR(time, outcome)\n")
 
     for i in range(numTrials):
         # Create a new Board instance
@@ -378,7 +927,7 @@ def algComparer(numTrials: int) -> None:
         # start ASTAR the timer
         ASTAROutcome = "Failed"
         startTimeASTAR = timeit.default_timer()
-        if ASTAR(b):
+        if ASTAR(b, statsFile="resultsASTAR_%d.csv" % i):
             elapsedTimeASTAR = timeit.default_timer() - startTimeASTAR
             ASTAROutcome = "Success"
         else:
@@ -387,7 +936,7 @@ def algComparer(numTrials: int) -> None:
         # start BestFS the timer
         BFSOutcome = "Failed"
         startTimeBestFS = timeit.default_timer()
-        if BestFS(b):
+        if BestFS(b, statsFile="resultsBFS_%d.csv" % i):
             elapsedTimeBestFS = timeit.default_timer() - startTimeBestFS
             BFSOutcome = "Success"
         else:
@@ -396,20 +945,33 @@ def algComparer(numTrials: int) -> None:
         # start DepthFS the timer
         DFSOutcome = "Failed"
         startTimeDepthFS = timeit.default_timer()
-        if DepthFS(b): 
+        if DepthFS(b, statsFile="resultsDFS_%d.csv" % i):
             elapsedTimeDepthFS = timeit.default_timer() - startTimeDepthFS
             DFSOutcome = "Success"
         else:
             elapsedTimeDepthFS = timeit.default_timer() - startTimeDepthFS
 
+        # start IDASTAR the timer
+        IDAOutcome = "Failed"
+        startTimeIDASTAR = timeit.default_timer()
+        if IDASTAR(b, statsFile="resultsIDASTAR_%d.csv" % i):
+            elapsedTimeIDASTAR = timeit.default_timer() - startTimeIDASTAR
+            IDAOutcome = "Success"
+        else:
+            elapsedTimeIDASTAR = timeit.default_timer() - startTimeIDASTAR
+
         # write run times to csv
-        FOUT1.write("%d,%.12f,%s,%.12f,%s,%.12f,%s\n" % (i, elapsedTimeASTAR*1000, ASTAROutcome, elapsedTimeBestFS*1000, BFSOutcome, elapsedTimeDepthFS*1000, DFSOutcome))
-    
+        FOUT1.write("%d,%.12f,%s,%.12f,%s,%.12f,%s,%.12f,%s\n" % (i, elapsedTimeASTAR*1000, ASTAROutcome, elapsedTimeBestFS*1000, BFSOutcome, elapsedTimeDepthFS*1000, DFSOutcome, elapsedTimeIDASTAR*1000, IDAOutcome))
+
+    FOUT1.close()
 
 
 #=====================================================
-def BFSvsASTAR(numTrials: int) -> None:
-    """Run the 8-puzzle solver using BFS/ASTAR and compare the run times. DFS not included due to being too slow."""
+def BFSvsASTAR(numTrials: int, seed: int = None) -> None:
+    """Run the 8-puzzle solver using BFS/ASTAR and compare the run times. DFS not included due to being too slow.
+    (each trial's search stats go to their own results<ALG>_<trial>.csv; seed: repeat the same boards every run)"""
+
+    seedBoards(seed)
 
     # Open csv and write header
     FOUT1 = open("BFSvsASTAR.csv", 'w')
@@ -424,7 +986,7 @@ def BFSvsASTAR(numTrials: int) -> None:
         # start ASTAR the timer
         ASTAROutcome = "Failed"
         startTimeASTAR = timeit.default_timer()
-        if ASTAR(b):
+        if ASTAR(b, statsFile="resultsASTAR_%d.csv" % i):
             elapsedTimeASTAR = timeit.default_timer() - startTimeASTAR
             ASTAROutcome = "Success"
         else:
@@ -433,7 +995,7 @@ def BFSvsASTAR(numTrials: int) -> None:
         # start BestFS the timer
         BFSOutcome = "Failed"
         startTimeBestFS = timeit.default_timer()
-        if BestFS(b):
+        if BestFS(b, statsFile="resultsBFS_%d.csv" % i):
             elapsedTimeBestFS = timeit.default_timer() - startTimeBestFS
             BFSOutcome = "Success"
         else:
@@ -442,6 +1004,39 @@ def BFSvsASTAR(numTrials: int) -> None:
         # write run times to csv
         FOUT1.write("%d,%.12f,%s,%.12f,%s\n" % (i, elapsedTimeASTAR*1000, ASTAROutcome, elapsedTimeBestFS*1000, BFSOutcome))
 
+    FOUT1.close()
+
+#=====================================================
+def openListComparer(numTrials: int, seed: int = None) -> None:
+    """Run ASTAR on the same boards with every OpenList backend and compare the run times.
+    (seed: repeat the same boards every run)"""
+
+    seedBoards(seed)
+
+    # Open csv and write header
+    FOUT1 = open("OpenListTimes.csv", 'w')
+    FOUT1.write("Run Time(milliseconds) - ASTAR Open List Comparison\n")
+    FOUT1.write("Trial Number, " + ", ".join("%s(time, outcome)" % name for name in OPEN_LISTS) + "\n")
+
+    for i in range(numTrials):
+        # Create a new Board instance
+        b = BoardClass()
+        b.initializePuzzleBoard()
+
+        FOUT1.write("%d" % i)
+        for name in OPEN_LISTS:
+            # start the timer
+            outcome = "Failed"
+            startTime = timeit.default_timer()
+            if ASTAR(b, openList=name):
+                outcome = "Success"
+            elapsedTime = timeit.default_timer() - startTime
+
+            FOUT1.write(",%.12f,%s" % (elapsedTime*1000, outcome))
+        FOUT1.write("\n")
+
+    FOUT1.close()
+
 #=====================================================
 
 #-----------\
@@ -0,0 +1,225 @@
+# ExternalBFS.py
+""" External-memory breadth first search over the whole state space
+
+Counts the boards at every distance from a start board (by default the
+GOAL, giving the exact distance histogram the heuristics are checked
+against) without holding the state space in memory. Every BFS level is a
+file of sorted, unique packed States (uint64). A level is expanded
+chunkSize boards at a time; each chunk's children are sorted, deduped and
+written to a run file. The runs are merged fanIn at a time (in several
+passes if there are more of them), each read through a buffer of
+chunkSize/fanIn States, and the boards of the two levels before are
+dropped by a streaming merge against their files. Memory use is
+O(chunkSize), and at most fanIn + 3 files are open, whatever the size of
+a level.
+
+Count the 8puzzle's states with:   python ExternalBFS.py [N] [chunkSize]
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import timeit
+import numpy as np
+from BoardClass import *
+from LayerSearch import expandLayer, rowKeys
+
+# boards read from (or buffered for) a level file at a time
+CHUNK_SIZE = 1 << 16
+
+# most run files merged at once
+FAN_IN = 16
+
+#=====================================================
+def levelFile(workDir: str, depth: int) -> str:
+    """Path of the file holding the States of a BFS level"""
+
+    return os.path.join(workDir, "level%d.bin" % depth)
+
+#=====================================================
+def readBlocks(path: str, chunkSize: int = CHUNK_SIZE):
+    """Yield the uint64 States of a level (or run) file, chunkSize at a time"""
+
+    with open(path, 'rb') as FIN:
+        while True:
+            block = np.fromfile(FIN, dtype=np.uint64, count=chunkSize)
+            if len(block) == 0:
+                return
+            yield block
+
+#=====================================================
+def unpackStates(states: np.ndarray, size: BoardSize) -> np.ndarray:
+    """(M, N^2) uint8 tiles of packed States"""
+
+    shifts = np.arange(size.NN, dtype=np.uint64) * np.uint64(size.BITS)
+    return ((states[:, None] >> shifts) & np.uint64(size.MASK)).astype(np.uint8)
+
+#=====================================================
+def expandLevel(path: str, size: BoardSize, workDir: str, chunkSize: int = CHUNK_SIZE) -> list[str]:
+    """Expand the level in path chunkSize boards at a time; returns the
+    sorted, deduped run files of the children"""
+
+    runs = []
+    for block in readBlocks(path, chunkSize):
+        children, parents = expandLayer(unpackStates(block, size), size)
+        runPath = os.path.join(workDir, "run%d.bin" % len(runs))
+        np.unique(rowKeys(children, size)).tofile(runPath)
+        runs.append(runPath)
+
+    return runs
+
+#=====================================================
+def mergeBlocks(paths: list[str], blockSize: int):
+    """Yield the union of sorted files of States, sorted and deduped, a block (NumPy array)
+    at a time; each file is read blockSize States at a time"""
+
+    readers = [readBlocks(path, blockSize) for path in paths]
+    buffers = [next(reader, None) for reader in readers]
+
+    while True:
+        live = [i for i in range(len(readers)) if buffers[i] is not None]
+        if not live:
+            return
+
+        # every State up to the lowest buffered maximum is in the buffers by now
+        limit = min(buffers[i][-1] for i in live)
+        parts = []
+        for i in live:
+            cut = np.searchsorted(buffers[i], limit, side='right')
+            parts.append(buffers[i][:cut])
+            buffers[i] = buffers[i][cut:]
+            if len(buffers[i]) == 0:
+                buffers[i] = next(readers[i], None)
+
+        yield np.unique(np.concatenate(parts))
+
+#=====================================================
+def mergeRuns(runs: list[str], workDir: str, fanIn: int = FAN_IN, chunkSize: int = CHUNK_SIZE) -> list[str]:
+    """Merge the sorted runs fanIn at a time (removing them) until at most fanIn are left;
+    returns the run files left"""
+
+    passes = 0
+    while len(runs) > fanIn:
+        merged = []
+        for start in range(0, len(runs), fanIn):
+            group = runs[start:start + fanIn]
+            runPath = os.path.join(workDir, "merge%d_%d.bin" % (passes, len(merged)))
+            with open(runPath, 'wb') as FOUT:
+                for block in mergeBlocks(group, max(1, chunkSize // len(group))):
+                    block.tofile(FOUT)
+            for run in group:
+                os.remove(run)
+            merged.append(runPath)
+        runs = merged
+        passes += 1
+
+    return runs
+
+#=====================================================
+def nextLevel(runs: list[str], seen: list[str], path: str, chunkSize: int = CHUNK_SIZE,
+              fanIn: int = FAN_IN) -> int:
+    """Merge the sorted runs (removing them) into path, dropping duplicates and
+    every State in the sorted files of seen; returns the number of States written"""
+
+    runs = mergeRuns(runs, os.path.dirname(path), fanIn, chunkSize)
+    blockSize = max(1, chunkSize // max(1, len(runs)))
+
+    # streaming cursors over the seen levels: [buffered States, rest of the file]
+    cursors = []
+    for seenPath in seen:
+        reader = readBlocks(seenPath, blockSize)
+        cursors.append([next(reader, None), reader])
+
+    count = 0
+    with open(path, 'wb') as FOUT:
+        for block in mergeBlocks(runs, blockSize):
+            # drop the States of the seen levels, reading them up to the block's last State
+            for cursor in cursors:
+                if len(block) == 0:
+                    break
+                keep = np.ones(len(block), dtype=bool)
+                while cursor[0] is not None:
+                    cut = np.searchsorted(cursor[0], block[-1], side='right')
+                    keep &= ~np.isin(block, cursor[0][:cut], assume_unique=True)
+                    if cut < len(cursor[0]):
+                        cursor[0] = cursor[0][cut:]
+                        break
+                    cursor[0] = next(cursor[1], None)
+                block = block[keep]
+
+            block.tofile(FOUT)
+            count += len(block)
+
+    for run in runs:
+        os.remove(run)
+
+    return count
+
+#=====================================================
+def externalBreadthFirst(startingBoard: BoardClass = None, workDir: str = None,
+                         chunkSize: int = CHUNK_SIZE, maxDepth: int = None, fanIn: int = FAN_IN) -> list[int]:
+    """Number of boards at each distance from startingBoard (default the 3x3 GOAL),
+    keeping the levels on disk in workDir (default a temporary directory, removed after);
+    fanIn: most run files merged (and so open) at once"""
+
+    if startingBoard is None:
+        size = BoardClass.getSize(3)
+        startingBoard = BoardClass.fromState(size.GoalState, 3)
+    size = startingBoard.Size
+
+    if size.NN * size.BITS > 64:
+        raise ValueError("external BFS packs boards into 64 bits: %dx%d boards don't fit" % (size.N, size.N))
+
+    tempDir = None
+    if workDir is None:
+        workDir = tempDir = tempfile.mkdtemp(prefix="ExternalBFS")
+
+    try:
+        np.array([startingBoard.State], dtype=np.uint64).tofile(levelFile(workDir, 0))
+        counts = [1]
+
+        while maxDepth is None or len(counts) <= maxDepth:
+            depth = len(counts) - 1
+            runs = expandLevel(levelFile(workDir, depth), size, workDir, chunkSize)
+
+            # a move only leads back to the level before (or this one)
+            seen = [levelFile(workDir, d) for d in range(max(0, depth - 1), depth + 1)]
+            count = nextLevel(runs, seen, levelFile(workDir, depth + 1), chunkSize, fanIn)
+
+            if depth >= 1:
+                os.remove(levelFile(workDir, depth - 1))
+
+            if count == 0:
+                break
+            counts.append(count)
+    finally:
+        if tempDir is not None:
+            shutil.rmtree(tempDir, ignore_errors=True)
+
+    return counts
+
+
+#-----------\
+# START HERE \
+#-----------------------------------------------------------
+if __name__ == '__main__':
+    N = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    chunkSize = int(sys.argv[2]) if len(sys.argv) > 2 else CHUNK_SIZE
+
+    size = BoardClass.getSize(N)
+    startTime = timeit.default_timer()
+    counts = externalBreadthFirst(BoardClass.fromState(size.GoalState, N), chunkSize=chunkSize)
+
+    FOUT = open("StateSpaceLayers.csv", 'w')
+    FOUT.write("External BFS Layer Counts (%dx%d)\n" % (N, N))
+    FOUT.write("Depth, States\n")
+    for depth, count in enumerate(counts):
+        FOUT.write("%d,%d\n" % (depth, count))
+        print("%2d: %d" % (depth, count))
+    FOUT.write("Total States: %d\n" % sum(counts))
+    FOUT.close()
+
+    print("Total States: %d (%.3f seconds)" % (sum(counts), timeit.default_timer() - startTime))
+
+#-----------------------------------------------------
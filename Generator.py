@@ -0,0 +1,157 @@
+# Generator.py
+""" Random solvable boards, one at a time or by the million
+
+No board is ever thrown away: a random board is built straight from a
+random blank cell and random Myrvold-Ruskey digits for the other tiles,
+the last digit picked so the order has the parity that board needs (see
+Ranking.solvableBoards()), which samples the solvable boards uniformly.
+
+generate() returns the boards packed into States (a NumPy array), and can
+ask for a range of depths: exact ones for 3x3 (every board at those
+distances in the StateDatabase is equally likely), random walks of that
+many moves from the GOAL for wider boards (so their depth is an upper bound).
+
+Time it with:   python Generator.py [count] [N]
+"""
+
+import sys
+import timeit
+import numpy as np
+from BoardClass import *
+from Ranking import solvableBoards, unrankSolvableArray
+
+
+#=====================================================
+def randomBoards(count: int, size: BoardSize, rng: np.random.Generator):
+    """NumPy (count, N^2) array of uniformly random solvable boards"""
+
+    blank = rng.integers(0, size.NN, count)
+    digits = [rng.integers(0, i, count) for i in range(size.NN - 1, 2, -1)]
+
+    return solvableBoards(blank, digits, size)
+
+#=====================================================
+def walkBoards(count: int, size: BoardSize, rng: np.random.Generator, fewest: int, most: int) -> tuple:
+    """(boards, moves): count random walks from the GOAL, of fewest..most moves
+    each, never undoing the last move (boards is a NumPy (count, N^2) array)"""
+
+    boards = np.tile(np.array([tile for row in size.GOAL for tile in row], dtype=np.uint8), (count, 1))
+    moves = rng.integers(fewest, most + 1, count)
+
+    # Neighbors padded to 4 columns with -1
+    table = np.full((size.NN, 4), -1, dtype=np.int64)
+    for cell, cells in enumerate(size.Neighbors):
+        table[cell, :len(cells)] = cells
+
+    blank = np.full(count, size.GoalTiles[0][0] * size.N + size.GoalTiles[0][1], dtype=np.int64)
+    previous = np.full(count, -1, dtype=np.int64)
+
+    # walks still going (the longest first, so every step just drops the tail)
+    order = np.argsort(-moves, kind='stable')
+    boards, moves = boards[order], moves[order]
+    flat = boards.reshape(-1)
+    offsets = np.arange(count, dtype=np.int64) * size.NN
+
+    for step in range(int(moves.max(initial=0))):
+        going = int(np.searchsorted(-moves, -step, side='left'))
+        targets = table[blank[:going]]
+        allowed = (targets >= 0) & (targets != previous[:going, None])
+
+        # pick one of the allowed targets of every walk at random
+        pick = (rng.random(going) * allowed.sum(axis=1)).astype(np.int64)
+        column = (np.cumsum(allowed, axis=1) <= pick[:, None]).sum(axis=1)
+        target = targets[np.arange(going), column]
+
+        flat[offsets[:going] + blank[:going]] = flat[offsets[:going] + target]
+        flat[offsets[:going] + target] = 0
+        previous[:going] = blank[:going]
+        blank[:going] = target
+
+    return boards, moves
+
+#=====================================================
+def packBoards(boards, size: BoardSize):
+    """Pack a NumPy (count, N^2) array of boards into States (see BoardClass.pack()):
+    a uint64 array if they fit in 64 bits (up to 4x4), else an array of Python ints"""
+
+    dtype = np.uint64 if size.BITS * size.NN <= 64 else object
+    shifts = np.array([size.BITS * cell for cell in range(size.NN)], dtype=dtype)
+
+    states = np.zeros(len(boards), dtype=dtype)
+    for cell in range(size.NN):
+        states |= boards[:, cell].astype(dtype) << shifts[cell]
+
+    return states
+
+#=====================================================
+def generate(count: int, seed=None, minDepth: int = None, maxDepth: int = None, N: int = None,
+             depths: bool = False):
+    """count random solvable NxN boards (default BoardClass.N) as packed States (a NumPy array);
+    seed: an int, a numpy Generator or None (random); minDepth/maxDepth: only boards that many
+    moves from the GOAL (exact for 3x3, random walk lengths for wider boards);
+    depths: also return their depths, as (States, depths)"""
+
+    rng = np.random.default_rng(seed)
+    size = BoardClass.getSize(N)
+
+    if size.N == 3 and (minDepth is not None or maxDepth is not None or depths):
+        from StateDatabase import StateDatabase, HEADER
+
+        # every board's distance, indexed by Ranking.rankSolvable(): pick indices in range
+        database = StateDatabase()
+        distances = np.frombuffer(database.Map[HEADER.size:], dtype=np.uint8)
+        database.close()
+
+        fewest = minDepth if minDepth is not None else 0
+        most = maxDepth if maxDepth is not None else int(distances.max())
+        candidates = np.flatnonzero((distances >= fewest) & (distances <= most))
+        if len(candidates) == 0:
+            raise ValueError("no 3x3 board is %d to %d moves from the GOAL" % (fewest, most))
+
+        indices = candidates[rng.integers(0, len(candidates), count)]
+        states = packBoards(unrankSolvableArray(indices, size), size)
+        return (states, distances[indices].astype(np.int64)) if depths else states
+
+    if minDepth is not None or maxDepth is not None:
+        boards, moves = walkBoards(count, size, rng, minDepth or 0, maxDepth if maxDepth is not None else minDepth)
+        states = packBoards(boards, size)
+        return (states, moves) if depths else states
+
+    if depths:
+        raise ValueError("exact depths are only known for 3x3 boards (give minDepth/maxDepth for random walks)")
+
+    return packBoards(randomBoards(count, size, rng), size)
+
+
+#-----------\
+# START HERE \
+#-----------------------------------------------------------
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    N = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    size = BoardClass.getSize(N)
+
+    for label, kwargs in (("uniform", {}), ("10..20 moves", {'minDepth': 10, 'maxDepth': 20})):
+        startTime = timeit.default_timer()
+        states = generate(count, 8, N=N, **kwargs)
+        elapsedTime = timeit.default_timer() - startTime
+        print("%dx%d %-13s %d boards in %.3f seconds (%.3f microseconds per board)" % (
+            N, N, label, len(states), elapsedTime, elapsedTime / count * 1e6))
+
+        # spot check that they are solvable (and, for 3x3, as far from the GOAL as asked)
+        if N == 3:
+            from StateDatabase import StateDatabase
+            database = StateDatabase()
+        for state in states[:1000]:
+            board = BoardClass.fromState(int(state), N)
+            assert board.isSolvable()
+            if N == 3 and kwargs:
+                assert kwargs['minDepth'] <= database.distance(board) <= kwargs['maxDepth']
+
+    startTime = timeit.default_timer()
+    board = BoardClass()
+    for i in range(10000):
+        board.initializePuzzleBoard(N)
+    print("initializePuzzleBoard %.3f microseconds per board" % ((timeit.default_timer() - startTime) / 10000 * 1e6))
+
+#-----------------------------------------------------
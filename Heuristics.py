@@ -0,0 +1,251 @@
+# Heuristics.py
+""" Registry of heuristics for the (N^2)-1 puzzle
+
+Select one at run time with BoardClass.useHeuristic(name), or pass
+heuristic=name to ASTAR/BestFS.  All registered heuristics ignore the
+blank (0) tile so they never overestimate the number of moves left.
+Each BoardSize gets its own instance (and tables) of a heuristic.
+"""
+
+from collections import deque
+from BoardClass import *
+
+# name -> Heuristic class (see registerHeuristic() at the bottom)
+HEURISTICS = {}
+
+class Heuristic():
+    """Base heuristic: the sum of Table[tile][cell] over all cells of a board.
+    Table driven heuristics are updated per move by BoardClass.moveBlank()"""
+
+    Name = ''
+    Description = ''
+
+    #=====================================================
+    def __init__(self, size: BoardSize) -> None:
+        """Constructor to build the tables for boards of the given size"""
+
+        self.Size = size
+
+        # [tile][cell] cost table (None if the heuristic is not a per tile sum)
+        self.Table = None
+
+        self.buildTables()
+
+    #=====================================================
+    def buildTables(self) -> None:
+        """Build the tables for Size (and its GOAL)"""
+
+        pass
+
+    #=====================================================
+    def evaluate(self, board: BoardClass) -> int:
+        """Compute the heuristic of board from scratch"""
+
+        sum = 0
+        state = board.State
+        MASK = self.Size.MASK
+        BITS = self.Size.BITS
+        for cell in range(self.Size.NN):
+            sum += self.Table[state & MASK][cell]
+            state >>= BITS
+
+        return sum
+
+
+#=====================================================
+class MisplacedTiles(Heuristic):
+    """Number of tiles (blank excluded) not in their GOAL cell"""
+
+    Name = 'misplaced'
+    Description = 'Misplaced Tiles'
+
+    def buildTables(self) -> None:
+        N = self.Size.N
+        NN = self.Size.NN
+        self.Table = [[0] * NN]
+        for goalRow, goalCol in self.Size.GoalTiles[1:]:
+            goalCell = goalRow * N + goalCol
+            self.Table.append([int(cell != goalCell) for cell in range(NN)])
+
+
+#=====================================================
+class ManhattanDistance(Heuristic):
+    """Sum of the Manhatten Distances of every tile (blank excluded) from its GOAL cell"""
+
+    Name = 'manhattan'
+    Description = 'Manhattan Distance'
+
+    def buildTables(self) -> None:
+        N = self.Size.N
+        NN = self.Size.NN
+        self.Table = [[0] * NN]
+        for goalRow, goalCol in self.Size.GoalTiles[1:]:
+            self.Table.append([abs(cell // N - goalRow) + abs(cell % N - goalCol)
+                               for cell in range(NN)])
+
+
+#=====================================================
+class LinearConflict(ManhattanDistance):
+    """Manhattan Distance plus 2 moves for every tile that has to leave its
+    GOAL row (or column) to let another tile of that line past it"""
+
+    Name = 'linear-conflict'
+    Description = 'Manhattan Distance + Linear Conflict'
+
+    def buildTables(self) -> None:
+        ManhattanDistance.buildTables(self)
+        # the linear conflict term is not a per tile sum, so the
+        # Manhattan table can't be used for incremental updates
+        self.Manhattan = self.Table
+        self.Table = None
+
+    def evaluate(self, board: BoardClass) -> int:
+        N = self.Size.N
+        arr = board.tiles()
+
+        sum = 0
+        for cell in range(N * N):
+            sum += self.Manhattan[arr[cell]][cell]
+
+        goalTiles = self.Size.GoalTiles
+        for line in range(N):
+            # goal columns of the tiles in row 'line' that belong in that row
+            rowGoals = []
+            # goal rows of the tiles in column 'line' that belong in that column
+            colGoals = []
+            for i in range(N):
+                tile = arr[line * N + i]
+                if tile != 0 and goalTiles[tile][0] == line:
+                    rowGoals.append(goalTiles[tile][1])
+                tile = arr[i * N + line]
+                if tile != 0 and goalTiles[tile][1] == line:
+                    colGoals.append(goalTiles[tile][0])
+
+            sum += 2 * (len(rowGoals) - longestIncreasing(rowGoals))
+            sum += 2 * (len(colGoals) - longestIncreasing(colGoals))
+
+        return sum
+
+
+#=====================================================
+def longestIncreasing(values: list[int]) -> int:
+    """Length of the longest increasing subsequence of values
+    (the tiles of a line that can stay put)"""
+
+    best = [1] * len(values)
+    for i in range(len(values)):
+        for j in range(i):
+            if values[j] < values[i] and best[j] + 1 > best[i]:
+                best[i] = best[j] + 1
+
+    return max(best, default=0)
+
+
+#=====================================================
+class PatternDatabase(Heuristic):
+    """Additive disjoint pattern databases: the non-blank tiles are split into
+    groups of PatternSize, and for every group the exact number of moves of its
+    own tiles needed to put them in place is precomputed. The group costs add up."""
+
+    Name = 'pdb'
+    Description = 'Additive Pattern Databases'
+
+    # largest number of tiles per group (4 keeps a 15-puzzle table at 64K entries)
+    PatternSize = 4
+
+    def buildTables(self) -> None:
+        tiles = list(range(1, self.Size.NN))
+        self.Patterns = [tiles[i:i + self.PatternSize] for i in range(0, len(tiles), self.PatternSize)]
+        self.Databases = [buildPatternDatabase(pattern, self.Size) for pattern in self.Patterns]
+
+    def evaluate(self, board: BoardClass) -> int:
+        NN = self.Size.NN
+        arr = board.tiles()
+
+        # cell of every tile
+        cells = [0] * NN
+        for cell in range(NN):
+            cells[arr[cell]] = cell
+
+        sum = 0
+        for pattern, database in zip(self.Patterns, self.Databases):
+            index = 0
+            for tile in pattern:
+                index = index * NN + cells[tile]
+            sum += database[index]
+
+        return sum
+
+
+#=====================================================
+def buildPatternDatabase(pattern: list[int], size: BoardSize) -> bytearray:
+    """Backwards 0-1 BFS from the GOAL over (blank cell, pattern tile cells);
+    only moves of pattern tiles cost 1. Returns a table indexed by the pattern
+    tile cells as a base N^2 number, holding the fewest moves over all blank cells."""
+
+    NN = size.NN
+    goalCells = [row * size.N + col for row, col in size.GoalTiles]
+
+    start = (goalCells[0],) + tuple(goalCells[tile] for tile in pattern)
+    distance = {start: 0}
+    Q = deque([start])
+
+    database = bytearray([255]) * (NN ** len(pattern))
+
+    while Q:
+        state = Q.popleft()
+        cost = distance[state]
+        blank = state[0]
+
+        index = 0
+        for cell in state[1:]:
+            index = index * NN + cell
+        if cost < database[index]:
+            database[index] = cost
+
+        for target in size.Neighbors[blank]:
+            if target in state[1:]:
+                # a pattern tile slides into the blank: costs a move
+                cells = list(state)
+                cells[cells.index(target, 1)] = blank
+                cells[0] = target
+                nextState = tuple(cells)
+                nextCost = cost + 1
+            else:
+                # a tile outside the pattern moves: free
+                nextState = (target,) + state[1:]
+                nextCost = cost
+
+            if nextCost < distance.get(nextState, 255):
+                distance[nextState] = nextCost
+                if nextCost == cost:
+                    Q.appendleft(nextState)
+                else:
+                    Q.append(nextState)
+
+    return database
+
+
+#=====================================================
+def registerHeuristic(heuristic: type) -> None:
+    """Add a Heuristic subclass to the registry under its Name"""
+
+    HEURISTICS[heuristic.Name] = heuristic
+
+#=====================================================
+def getHeuristic(name: str, size: BoardSize) -> Heuristic:
+    """The registered heuristic's instance for boards of size (built on first use)"""
+
+    if name not in HEURISTICS:
+        raise ValueError("unknown heuristic: %s (choose from %s)" % (name, ", ".join(HEURISTICS)))
+
+    if name not in size.Heuristics:
+        size.Heuristics[name] = HEURISTICS[name](size)
+
+    return size.Heuristics[name]
+
+
+registerHeuristic(MisplacedTiles)
+registerHeuristic(ManhattanDistance)
+registerHeuristic(LinearConflict)
+registerHeuristic(PatternDatabase)
@@ -0,0 +1,176 @@
+# LayerSearch.py
+""" Layer-synchronous searches on NumPy arrays of boards
+
+A whole frontier layer is held as an (M, N^2) uint8 array, one row per
+board (the tiles in row major order). expandLayer() makes every legal child
+of every row at once, scoreLayer() scores them with the heuristic's
+[tile][cell] table in one gather, and uniqueLayer() drops duplicates with
+np.unique, so a BFS level or a beam costs a few array operations instead
+of a Python loop per board and per cell.
+"""
+
+import math
+import timeit
+import numpy as np
+from BoardClass import *
+from SearchResult import SearchResult
+
+# width -> (N^2, 4) array of the cells the empty tile can slide to (-1 = no move)
+MOVE_TABLES = {}
+
+#=====================================================
+def moveTable(size: BoardSize) -> np.ndarray:
+    """size.Neighbors as an array, padded with -1"""
+
+    if size.N not in MOVE_TABLES:
+        table = np.full((size.NN, 4), -1, dtype=np.intp)
+        for cell, targets in enumerate(size.Neighbors):
+            table[cell, :len(targets)] = targets
+        MOVE_TABLES[size.N] = table
+
+    return MOVE_TABLES[size.N]
+
+#=====================================================
+def boardsToLayer(boards: list[BoardClass]) -> np.ndarray:
+    """(M, N^2) uint8 array of the tiles of boards (all the same size)"""
+
+    return np.array([board.tiles() for board in boards], dtype=np.uint8).reshape(len(boards), -1)
+
+#=====================================================
+def rowKeys(layer: np.ndarray, size: BoardSize) -> np.ndarray:
+    """One comparable key per row: the packed State as uint64 when it fits
+    (up to 4x4), else the row's bytes"""
+
+    if size.NN * size.BITS <= 64:
+        shifts = np.arange(size.NN, dtype=np.uint64) * np.uint64(size.BITS)
+        return np.bitwise_or.reduce(layer.astype(np.uint64) << shifts, axis=1)
+
+    return np.ascontiguousarray(layer).view(np.dtype((np.void, size.NN))).ravel()
+
+#=====================================================
+def expandLayer(layer: np.ndarray, size: BoardSize) -> tuple:
+    """Every legal child of every row of layer: returns (children, parents)
+    where parents[i] is the row of layer children[i] was made from"""
+
+    blanks = np.argmax(layer == 0, axis=1)
+    targets = moveTable(size)[blanks]
+
+    parents, moves = np.nonzero(targets >= 0)
+    blanks = blanks[parents]
+    targets = targets[parents, moves]
+
+    # slide the tile at the target cell into the blank cell
+    children = layer[parents]
+    rows = np.arange(len(children))
+    children[rows, blanks] = children[rows, targets]
+    children[rows, targets] = 0
+
+    return children, parents
+
+#=====================================================
+def scoreLayer(layer: np.ndarray, heuristic) -> np.ndarray:
+    """Heuristic of every row, from the heuristic's [tile][cell] table
+    (Manhattan distance, misplaced tiles, ...) in one gather"""
+
+    if heuristic.Table is None:
+        raise ValueError("heuristic %s has no [tile][cell] table to vectorize" % heuristic.Name)
+
+    table = np.asarray(heuristic.Table, dtype=np.int32)
+    return table[layer, np.arange(layer.shape[1])].sum(axis=1)
+
+#=====================================================
+def uniqueLayer(layer: np.ndarray, size: BoardSize) -> tuple:
+    """Drop duplicate rows: returns (unique rows, their keys, row of layer each came from)"""
+
+    keys, index = np.unique(rowKeys(layer, size), return_index=True)
+
+    return layer[index], keys, index
+
+
+#=====================================================
+def breadthFirstLayers(startingBoard: BoardClass, maxDepth: int = None) -> list[int]:
+    """Number of boards at each distance from startingBoard (the whole
+    reachable space, or up to maxDepth), found one BFS level at a time"""
+
+    size = startingBoard.Size
+    layer = boardsToLayer([startingBoard])
+    keys = rowKeys(layer, size)
+    previousKeys = keys[:0]
+
+    counts = [1]
+    while maxDepth is None or len(counts) <= maxDepth:
+        children, parents = expandLayer(layer, size)
+        children, childKeys, index = uniqueLayer(children, size)
+
+        # a move can only lead back one level (or stay on this one), so only
+        # the last two levels have to be checked for boards seen before
+        new = ~(np.isin(childKeys, keys) | np.isin(childKeys, previousKeys))
+        if not new.any():
+            break
+
+        layer = children[new]
+        previousKeys, keys = keys, childKeys[new]
+        counts.append(len(layer))
+
+    return counts
+
+#=====================================================
+def beamSearch(startingBoard: BoardClass, width: int = 1000, heuristic: str = None,
+               maxDepth: int = 200) -> SearchResult:
+    """Beam search: expand a whole level at a time, keeping only the width
+    children with the lowest heuristic (not optimal, but fast and small).
+    heuristic: name of a table driven Heuristics.HEURISTICS entry (default the active
+    one, or manhattan if the active one has no table, like linear-conflict and pdb)"""
+
+    from Heuristics import getHeuristic
+
+    size = startingBoard.Size
+    if heuristic is not None:
+        scorer = getHeuristic(heuristic, size)
+    elif size.ActiveHeuristic.Table is not None:
+        scorer = size.ActiveHeuristic
+    else:
+        scorer = getHeuristic('manhattan', size)
+    goalKey = rowKeys(boardsToLayer([BoardClass.fromState(size.GoalState, size.N)]), size)[0]
+
+    layer = boardsToLayer([startingBoard])
+    keys = rowKeys(layer, size)
+
+    # per level: (parents, blank cell) of the kept boards, to rebuild the path
+    levels = []
+    explored = 0
+    startTime = timeit.default_timer()
+    maxFrontier = 1
+
+    while not (keys == goalKey).any():
+        if len(levels) >= maxDepth:
+            return SearchResult("BEAM", None, explored, maxFrontier, 0, timeit.default_timer() - startTime, math.inf)
+
+        children, parents = expandLayer(layer, size)
+        explored += len(layer)
+        children, childKeys, index = uniqueLayer(children, size)
+        parents = parents[index]
+
+        # don't step back onto the boards of the current level
+        new = ~np.isin(childKeys, keys)
+        children, childKeys, parents = children[new], childKeys[new], parents[new]
+        if len(children) == 0:
+            return SearchResult("BEAM", None, explored, maxFrontier, 0, timeit.default_timer() - startTime, math.inf)
+
+        if len(children) > width:
+            best = np.argsort(scoreLayer(children, scorer), kind='stable')[:width]
+            children, childKeys, parents = children[best], childKeys[best], parents[best]
+
+        levels.append((parents, np.argmax(children == 0, axis=1)))
+        layer, keys = children, childKeys
+        maxFrontier = max(maxFrontier, len(layer))
+
+    # walk the parents back from the GOAL row
+    path = []
+    row = int(np.nonzero(keys == goalKey)[0][0])
+    for parents, blanks in reversed(levels):
+        path.append(int(blanks[row]))
+        row = int(parents[row])
+    path.reverse()
+
+    return SearchResult("BEAM", path, explored, maxFrontier, 0, timeit.default_timer() - startTime, math.inf)
@@ -0,0 +1,164 @@
+# OpenList.py
+""" Open lists (priority queues of Boards) for ASTAR and BestFS
+
+queue.PriorityQueue locks on every call, which a single threaded search
+doesn't need. These open lists all have the same interface:
+    push(priority, board) -> bool   pop() -> (priority, board)   peek() -> priority   len(Q)
+and support decrease-key: pushing a board again with a lower priority
+replaces the old entry (which is skipped lazily when it reaches the front),
+pushing it with an equal or higher priority is ignored.
+"""
+
+import heapq
+from BoardClass import *
+
+class OpenList():
+    """Base open list: keeps the best priority of every queued board for lazy invalidation"""
+
+    #=====================================================
+    def __init__(self) -> None:
+        """Constructor to initialize an empty open list"""
+
+        # boardKey -> (priority, entry number) of the live entry for that board
+        self.Best = {}
+
+        # tie breaker value: number of entries pushed so far
+        self.Count = 0
+
+    #=====================================================
+    def push(self, priority: int, board: BoardClass) -> bool:
+        """Queue board with priority; returns False if it is already queued with a priority as good"""
+
+        key = board.boardKey()
+        best = self.Best.get(key)
+        if best is not None and best[0] <= priority:
+            return False
+
+        self.Best[key] = (priority, self.Count)
+        self.insert(priority, self.Count, board)
+        self.Count += 1
+
+        return True
+
+    #=====================================================
+    def pop(self) -> tuple:
+        """Remove and return (priority, board) with the lowest priority"""
+
+        while True:
+            priority, count, board = self.remove()
+
+            # skip entries replaced by a later (lower priority) push
+            key = board.boardKey()
+            if self.Best.get(key) == (priority, count):
+                del self.Best[key]
+                return priority, board
+
+    #=====================================================
+    def peek(self) -> int:
+        """Lowest live priority (without removing its board; stale entries in front of it are dropped)"""
+
+        while True:
+            priority, count, board = self.head()
+            if self.Best.get(board.boardKey()) == (priority, count):
+                return priority
+            self.remove()
+
+    #=====================================================
+    def __len__(self) -> int:
+        """Number of live (not invalidated) entries"""
+
+        return len(self.Best)
+
+    #=====================================================
+    def insert(self, priority: int, count: int, board: BoardClass) -> None:
+        """Backend: store an entry"""
+
+        raise NotImplementedError
+
+    #=====================================================
+    def remove(self) -> tuple:
+        """Backend: remove and return the lowest (priority, count, board) entry (may be stale)"""
+
+        raise NotImplementedError
+
+    #=====================================================
+    def head(self) -> tuple:
+        """Backend: the lowest (priority, count, board) entry, left in place (may be stale)"""
+
+        raise NotImplementedError
+
+
+#=====================================================
+class HeapOpenList(OpenList):
+    """Open list on a plain heapq list (ties go to the board pushed first)"""
+
+    def __init__(self) -> None:
+        OpenList.__init__(self)
+        self.Heap = []
+
+    def insert(self, priority: int, count: int, board: BoardClass) -> None:
+        heapq.heappush(self.Heap, (priority, count, board))
+
+    def remove(self) -> tuple:
+        return heapq.heappop(self.Heap)
+
+    def head(self) -> tuple:
+        return self.Heap[0]
+
+
+#=====================================================
+class BucketOpenList(OpenList):
+    """Bucket queue: one LIFO list per (small, non-negative int) priority,
+    so push and pop are O(1) apart from skipping empty buckets"""
+
+    def __init__(self) -> None:
+        OpenList.__init__(self)
+        self.Buckets = []
+        # lowest bucket that may be non-empty
+        self.Lowest = 0
+
+    def insert(self, priority: int, count: int, board: BoardClass) -> None:
+        while len(self.Buckets) <= priority:
+            self.Buckets.append([])
+        self.Buckets[priority].append((priority, count, board))
+        if priority < self.Lowest:
+            self.Lowest = priority
+
+    def remove(self) -> tuple:
+        while not self.Buckets[self.Lowest]:
+            self.Lowest += 1
+        return self.Buckets[self.Lowest].pop()
+
+    def head(self) -> tuple:
+        while not self.Buckets[self.Lowest]:
+            self.Lowest += 1
+        return self.Buckets[self.Lowest][-1]
+
+
+#=====================================================
+class PriorityQueueOpenList(OpenList):
+    """The original queue.PriorityQueue (thread safe, locks on every call);
+    kept to compare the other backends against"""
+
+    def __init__(self) -> None:
+        import queue
+        OpenList.__init__(self)
+        self.Q = queue.PriorityQueue()
+
+    def insert(self, priority: int, count: int, board: BoardClass) -> None:
+        self.Q.put((priority, count, board))
+
+    def remove(self) -> tuple:
+        return self.Q.get()
+
+    def head(self) -> tuple:
+        with self.Q.mutex:
+            return self.Q.queue[0]
+
+
+# name -> open list class, for the openList= argument of ASTAR/BestFS
+OPEN_LISTS = {
+    'heap': HeapOpenList,
+    'bucket': BucketOpenList,
+    'priority-queue': PriorityQueueOpenList,
+}
@@ -0,0 +1,335 @@
+# ParallelSearch.py
+""" Hash distributed A* (HDA*) on several worker processes
+
+Every board has one owner: the worker picked by its Zobrist hash (a XOR of
+a random 64 bit number per (cell, tile), updated in O(1) per move). Each
+worker runs A* on the boards it owns, with its own open list and best-g
+table; children owned by another worker are batched up and sent to that
+worker's inbox queue. Whoever receives the GOAL posts its cost as the shared
+incumbent, and every worker prunes boards whose f can't beat it.
+
+The search is over when the incumbent is proven optimal: every worker is
+idle (nothing left with f below the incumbent) and every board sent has
+been received, seen the same way by two snapshots in a row.
+
+Try it with:   python ParallelSearch.py [N] [workers] [scramble]
+"""
+
+import heapq
+import multiprocessing
+import os
+import queue
+import random
+import sys
+import timeit
+from BoardClass import *
+from SearchResult import SearchResult
+from SearchStats import openStats
+from SolutionWriter import SolutionWriter, solutionWriter
+
+# seed of the Zobrist numbers (the same in every process)
+ZOBRIST_SEED = 15
+
+# incumbent cost while no solution is known
+NO_SOLUTION = 1 << 62
+
+# per worker counters in the shared array: boards sent, boards received, idle flag
+SENT, RECEIVED, IDLE = 0, 1, 2
+
+# boards a worker expands between checks of its inbox (and flushes of part full batches)
+EXPANSIONS_PER_ROUND = 64
+
+
+#=====================================================
+def zobristTable(size: BoardSize, seed: int = ZOBRIST_SEED) -> list[list[int]]:
+    """Random 64 bit number for every [cell][tile] of a board of size"""
+
+    rng = random.Random(seed)
+    return [[rng.getrandbits(64) for tile in range(size.NN)] for cell in range(size.NN)]
+
+#=====================================================
+def zobristHash(arr: list[int], table: list[list[int]]) -> int:
+    """Zobrist hash of a board (flat list of tiles)"""
+
+    key = 0
+    for cell, tile in enumerate(arr):
+        key ^= table[cell][tile]
+
+    return key
+
+#=====================================================
+def hdaWorker(worker: int, workers: int, N: int, heuristic: str, batchSize: int, inboxes: list,
+              results, counters, incumbent, stop) -> None:
+    """One HDA* worker process: A* over the boards whose Zobrist hash picks this worker.
+    Puts ('solution', cost, moves) for every better solution it receives and
+    ('stats', worker, explored, sent, duplicates, max open size) when stopped"""
+
+    BoardClass.useHeuristic(heuristic)
+    size = BoardClass.getSize(N)
+    table = zobristTable(size)
+    inbox = inboxes[worker]
+    for other in inboxes:
+        # never block exiting on a batch nobody will read (there is none once the search is proven over)
+        other.cancel_join_thread()
+
+    # open list of (f, h, g, State, Blank, hash, moves): moves are the path's 2 bit move codes
+    Q = []
+    # State -> best g received
+    best = {}
+    # owner -> batch of (State, Blank, g, h, hash, moves) boards to send
+    outboxes = [[] for i in range(workers)]
+
+    scratch = BoardClass(N)
+    explored = 0
+    sent = 0
+    duplicates = 0
+    maxQueueSize = 0
+
+    base = worker * 3
+
+    def receive(node: tuple) -> None:
+        nonlocal duplicates
+        state, blank, g, h, key, moves = node
+
+        if g >= best.get(state, NO_SOLUTION):
+            duplicates += 1
+            return
+        best[state] = g
+
+        if state == size.GoalState:
+            # a solution: post it if it beats the incumbent
+            with incumbent.get_lock():
+                if g < incumbent.value:
+                    incumbent.value = g
+                    results.put(('solution', g, moves))
+            return
+
+        if g + h < incumbent.value:
+            heapq.heappush(Q, (g + h, h, g, state, blank, key, moves))
+
+    def send(owner: int) -> None:
+        nonlocal sent
+        batch = outboxes[owner]
+        # count the boards as sent before they can be received
+        counters[base + SENT] += len(batch)
+        sent += len(batch)
+        inboxes[owner].put(batch)
+        outboxes[owner] = []
+
+    while not stop.value:
+        # take in every batch waiting in the inbox
+        while True:
+            try:
+                batch = inbox.get_nowait()
+            except queue.Empty:
+                break
+            counters[base + IDLE] = 0
+            for node in batch:
+                receive(node)
+            counters[base + RECEIVED] += len(batch)
+
+        # expand a round of the best boards
+        expanded = 0
+        while Q and expanded < EXPANSIONS_PER_ROUND:
+            f, h, g, state, blank, key, moves = heapq.heappop(Q)
+            if f >= incumbent.value:
+                # nothing left here can beat the incumbent
+                Q = []
+                break
+            if g > best[state]:
+                # a better path to this board came in since it was queued
+                continue
+
+            expanded += 1
+            explored += 1
+            scratch.State = state
+            scratch.Blank = blank
+            scratch.Heuristic = h
+            # never slide straight back (the reverse of the last move)
+            back = blank - size.MoveSteps[moves & 3] if g > 0 else -1
+
+            for target in size.Neighbors[blank]:
+                if target == back: continue
+
+                tile = scratch.tileAt(target)
+                scratch.moveBlank(target)
+                childKey = key ^ table[blank][0] ^ table[target][tile] ^ table[blank][tile] ^ table[target][0]
+                child = (scratch.State, target, g + 1, scratch.Heuristic, childKey,
+                         (moves << 2) | size.MoveCodes[target - blank])
+                scratch.moveBlank(blank)
+                scratch.Heuristic = h
+
+                if g + 1 + child[3] >= incumbent.value: continue
+
+                owner = childKey % workers
+                if owner == worker:
+                    receive(child)
+                else:
+                    outboxes[owner].append(child)
+                    if len(outboxes[owner]) >= batchSize:
+                        send(owner)
+
+        maxQueueSize = max(maxQueueSize, len(Q))
+
+        # hand over part full batches every round, so no worker waits on them
+        for owner in range(workers):
+            if outboxes[owner]:
+                send(owner)
+
+        if not Q:
+            # idle until a batch comes in (or the search is stopped)
+            counters[base + IDLE] = 1
+            try:
+                batch = inbox.get(timeout=0.01)
+            except queue.Empty:
+                continue
+            counters[base + IDLE] = 0
+            for node in batch:
+                receive(node)
+            counters[base + RECEIVED] += len(batch)
+
+    results.put(('stats', worker, explored, sent, duplicates, maxQueueSize))
+
+#=====================================================
+def finished(counters, workers: int) -> tuple:
+    """Snapshot of the workers: (all idle, boards sent, boards received)"""
+
+    values = counters[:]
+    idle = all(values[worker * 3 + IDLE] for worker in range(workers))
+    sent = sum(values[worker * 3 + SENT] for worker in range(workers + 1))
+    received = sum(values[worker * 3 + RECEIVED] for worker in range(workers + 1))
+
+    return idle, sent, received
+
+#=====================================================
+def HDASTAR(startingBoard: BoardClass, heuristic: str = None, workers: int = None, batchSize: int = 64,
+            statsFile: str = "resultsHDASTAR.csv", output: SolutionWriter = None) -> SearchResult:
+    """Solve the puzzle by hash distributed A* on workers processes (default one per core)"""
+
+    if heuristic is not None:
+        BoardClass.useHeuristic(heuristic)
+        startingBoard.computeDistanceFromGoal()
+        startingBoard.Cost = startingBoard.Heuristic + startingBoard.PathLength
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    # Stats (one row per worker, written out when the search ends)
+    stats = openStats(statsFile, "HDASTAR Search Stats",
+                      [("Worker", "%d"), ("Boards Explored", "%d"), ("Boards Sent", "%d"),
+                       ("Duplicates Skipped", "%d"), ("Max Queue Size", "%d")])
+
+    startTime = timeit.default_timer()
+
+    if not startingBoard.isSolvable():
+        print("HDASTAR: board can't reach the GOAL")
+        stats.flush()
+        return SearchResult("HDASTAR", None, 0, 0, 0, timeit.default_timer() - startTime)
+
+    size = startingBoard.Size
+    inboxes = [multiprocessing.Queue() for i in range(workers)]
+    results = multiprocessing.Queue()
+    # one row of counters per worker, plus one for this process (it sends the starting board)
+    counters = multiprocessing.Array('q', (workers + 1) * 3, lock=False)
+    incumbent = multiprocessing.Value('q', NO_SOLUTION)
+    stop = multiprocessing.Value('b', 0, lock=False)
+
+    processes = [multiprocessing.Process(target=hdaWorker, daemon=True,
+                                         args=(worker, workers, size.N, BoardClass.HeuristicName, batchSize,
+                                               inboxes, results, counters, incumbent, stop))
+                 for worker in range(workers)]
+    for process in processes:
+        process.start()
+
+    # hand the starting board to its owner
+    key = zobristHash(startingBoard.tiles(), zobristTable(size))
+    counters[workers * 3 + SENT] = 1
+    inboxes[key % workers].put([(startingBoard.State, startingBoard.Blank, 0, startingBoard.Heuristic, key, 0)])
+
+    # wait for the workers to prove the incumbent optimal
+    bestMoves = None
+    previous = None
+    while True:
+        try:
+            message = results.get(timeout=0.005)
+            if message[0] == 'solution' and message[1] == incumbent.value:
+                bestMoves = message[1:]
+            continue
+        except queue.Empty:
+            pass
+
+        snapshot = finished(counters, workers)
+        if snapshot[0] and snapshot[1] == snapshot[2] and snapshot == previous:
+            break
+        previous = snapshot
+
+    stop.value = 1
+    workerStats = []
+    while len(workerStats) < workers:
+        message = results.get()
+        if message[0] == 'stats':
+            workerStats.append(message[1:])
+        elif message[1] == incumbent.value:
+            bestMoves = message[1:]
+    for process in processes:
+        process.join()
+
+    elapsedTime = timeit.default_timer() - startTime
+
+    if stats.Path is not None:
+        for row in sorted(workerStats):
+            stats.record(*row)
+
+    explored = sum(row[1] for row in workerStats)
+    duplicates = sum(row[3] for row in workerStats)
+    maxQueueSize = sum(row[4] for row in workerStats)
+
+    path = None
+    if startingBoard.isGoal():
+        path = []
+    elif bestMoves is not None:
+        # unpack the move codes, oldest first, into the cells the empty tile moved to
+        cost, moves = bestMoves
+        path = []
+        blank = startingBoard.Blank
+        for i in range(cost - 1, -1, -1):
+            blank += size.MoveSteps[(moves >> (2 * i)) & 3]
+            path.append(blank)
+
+    if path is not None:
+        print("HDASTAR: Solution found!")
+        solutionWriter(output).write(startingBoard, path, "HDASTAR")
+    else:
+        print("No Solution ... ???")
+
+    stats.summarize("Workers", workers)
+    stats.summarize("Boards Explored", explored)
+    stats.summarize("Duplicates Skipped", duplicates)
+    print("HDASTAR: %d workers explored %d boards\n" % (workers, explored))
+    stats.flush()
+
+    return SearchResult("HDASTAR", path, explored, maxQueueSize, duplicates, elapsedTime)
+
+
+#-----------\
+# START HERE \
+#-----------------------------------------------------------
+if __name__ == '__main__':
+    N = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    scramble = int(sys.argv[3]) if len(sys.argv) > 3 else 40
+
+    # a random walk from the GOAL (never undoing the last move)
+    size = BoardClass.getSize(N)
+    board = BoardClass.fromState(size.GoalState, N)
+    previous = -1
+    for i in range(scramble):
+        targets = [cell for cell in size.Neighbors[board.Blank] if cell != previous]
+        previous = board.Blank
+        board.moveBlank(random.choice(targets))
+    board = BoardClass.fromState(board.State, N)
+
+    print(board)
+    print(HDASTAR(board, workers=workers, output='moves'))
+
+#-----------------------------------------------------
@@ -0,0 +1,213 @@
+# Ranking.py
+""" Perfect hashing of boards to dense integers (and back)
+
+rankPermutation() is Myrvold and Ruskey's linear time ranking: it maps the
+n! permutations of 0..n-1 onto 0..n!-1 using a permutation and its inverse,
+instead of the O(n^2) Lehmer code. Its most significant mixed radix digit
+only decides whether the last swap happens, which flips the permutation's
+parity, so rank mod n!/2 is a dense index within one parity.
+
+rankSolvable() uses that to number only the boards that can reach the
+GOAL: blank cell * (N^2-1)!/2 + the rank of the other tiles' order mod
+(N^2-1)!/2 (for a given blank cell that order always has the same parity).
+Indices like these can address bytearrays and bitsets directly (see
+VisitedSet.BitsetVisitedSet and StateDatabase).
+
+Time it with:   python Ranking.py [N]
+(the round trip tests are in test_Ranking.py:   python -m pytest)
+"""
+
+import math
+import sys
+import timeit
+from BoardClass import *
+
+#=====================================================
+def rankPermutation(perm: list[int]) -> int:
+    """Myrvold-Ruskey rank of a permutation of 0..n-1, in 0..n!-1 (O(n))"""
+
+    n = len(perm)
+    perm = list(perm)
+    inverse = [0] * n
+    for i in range(n):
+        inverse[perm[i]] = i
+
+    rank = 0
+    multiplier = 1
+    for i in range(n - 1, 0, -1):
+        # move i to the end: swap perm[i] with the cell holding i
+        s = perm[i]
+        j = inverse[i]
+        perm[i], perm[j] = i, s
+        inverse[s], inverse[i] = j, i
+
+        rank += s * multiplier
+        multiplier *= i + 1
+
+    return rank
+
+#=====================================================
+def unrankPermutation(rank: int, n: int) -> list[int]:
+    """The permutation of 0..n-1 with Myrvold-Ruskey rank rank (O(n))"""
+
+    perm = list(range(n))
+    for i in range(n, 0, -1):
+        rank, s = divmod(rank, i)
+        perm[i - 1], perm[s] = perm[s], perm[i - 1]
+
+    return perm
+
+#=====================================================
+def permutationParity(rank: int, n: int) -> int:
+    """Parity of the permutation with the given rank: one per swap unrankPermutation() makes"""
+
+    parity = 0
+    for i in range(n, 1, -1):
+        rank, s = divmod(rank, i)
+        if s != i - 1:
+            parity ^= 1
+
+    return parity
+
+#=====================================================
+def solvableCount(size: BoardSize) -> int:
+    """Number of boards of size that can reach the GOAL ((N^2)!/2)"""
+
+    return math.factorial(size.NN) // 2
+
+#=====================================================
+def rankSolvable(arr: list[int], size: BoardSize) -> int:
+    """Dense index in 0..(N^2)!/2-1 of a solvable board (flat list of tiles)"""
+
+    blank = arr.index(0)
+    others = [tile - 1 for tile in arr if tile != 0]
+    half = math.factorial(size.NN - 1) // 2
+
+    return blank * half + rankPermutation(others) % half
+
+#=====================================================
+def unrankSolvable(index: int, size: BoardSize) -> list[int]:
+    """The solvable board (flat list of tiles) with dense index index"""
+
+    half = math.factorial(size.NN - 1) // 2
+    blank, rank = divmod(index, half)
+
+    # parity the other tiles' order needs for this blank cell (see BoardSize.parity())
+    parity = size.GoalParity
+    if size.N % 2 == 0:
+        parity ^= (blank // size.N) & 1
+    if permutationParity(rank, size.NN - 1) != parity:
+        rank += half
+
+    others = unrankPermutation(rank, size.NN - 1)
+    arr = [tile + 1 for tile in others]
+    arr.insert(blank, 0)
+
+    return arr
+
+#=====================================================
+def solvableBoards(blank, digits: list, size: BoardSize):
+    """NumPy (count, N^2) array of the solvable boards with the given blank cells and the
+    other tiles' Myrvold-Ruskey digits (digits[k] < N^2-1-k, one array per digit but the
+    last, which the parity picks) -- unrankPermutation() for a whole array of boards"""
+
+    import numpy as np
+
+    # one row per cell (perm[i] is cell i of every board), so each swap reads whole rows
+    m = size.NN - 1
+    columns = np.arange(len(blank))
+    perm = np.repeat(np.arange(1, m + 1, dtype=np.uint8)[:, None], len(blank), axis=1)
+    parity = np.zeros(len(blank), dtype=bool)
+
+    def swap(i, s):
+        last = perm[i].copy()
+        perm[i] = perm[s, columns]
+        perm[s, columns] = last
+
+    for i, s in zip(range(m, 2, -1), digits):
+        swap(i - 1, s)
+        parity ^= s != i - 1
+
+    # the last swap (or not) gives the order the parity the blank cell needs (see unrankSolvable())
+    need = np.full(len(blank), size.GoalParity, dtype=bool)
+    if size.N % 2 == 0:
+        need ^= (blank // size.N) % 2 == 1
+    swap(1, (parity == need).astype(np.int64))
+
+    # put the blank (0) in at its cell, shifting the tiles after it along
+    boards = np.empty((len(blank), size.NN), dtype=np.uint8)
+    for cell in range(size.NN):
+        before = perm[min(cell, m - 1)]
+        after = perm[cell - 1] if cell > 0 else before
+        boards[:, cell] = np.where(blank > cell, before, np.where(blank < cell, after, 0))
+
+    return boards
+
+#=====================================================
+def unrankSolvableArray(indices, size: BoardSize):
+    """NumPy (count, N^2) array of the solvable boards with the given dense indices
+    (unrankSolvable() for a whole array of them, up to 4x4)"""
+
+    import numpy as np
+
+    half = math.factorial(size.NN - 1) // 2
+    blank, rank = np.divmod(np.asarray(indices, dtype=np.int64), half)
+
+    digits = []
+    for i in range(size.NN - 1, 2, -1):
+        rank, s = np.divmod(rank, i)
+        digits.append(s)
+
+    return solvableBoards(blank, digits, size)
+
+#=====================================================
+def lehmerRank(perm: list[int]) -> int:
+    """Lehmer code rank of a permutation of 0..n-1 (O(n^2), for comparison)"""
+
+    rank = 0
+    n = len(perm)
+    for i in range(n - 1):
+        smaller = 0
+        for j in range(i + 1, n):
+            if perm[j] < perm[i]:
+                smaller += 1
+        rank += smaller * math.factorial(n - 1 - i)
+
+    return rank
+
+
+#-----------\
+# START HERE \
+#-----------------------------------------------------------
+if __name__ == '__main__':
+    N = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    size = BoardClass.getSize(N)
+    count = solvableCount(size)
+
+    # micro-benchmark: rank the same boards with each method
+    boards = [unrankSolvable(index, size) for index in range(0, count, max(1, count // 10000))]
+    perms = [[tile - 1 for tile in arr if tile != 0] for arr in boards]
+    for name, function in (("Myrvold-Ruskey", rankPermutation), ("Lehmer", lehmerRank)):
+        startTime = timeit.default_timer()
+        for perm in perms:
+            function(perm)
+        elapsedTime = timeit.default_timer() - startTime
+        print("%-15s %.3f microseconds per rank" % (name, elapsedTime / len(perms) * 1e6))
+
+    startTime = timeit.default_timer()
+    for arr in boards:
+        rankSolvable(arr, size)
+    print("%-15s %.3f microseconds per board" % ("rankSolvable", (timeit.default_timer() - startTime) / len(boards) * 1e6))
+
+    startTime = timeit.default_timer()
+    for index in range(0, count, max(1, count // 10000)):
+        unrankSolvable(index, size)
+    print("%-15s %.3f microseconds per board" % ("unrankSolvable", (timeit.default_timer() - startTime) / len(boards) * 1e6))
+
+    if size.NN <= 16:
+        indices = list(range(0, count, max(1, count // 10000)))
+        startTime = timeit.default_timer()
+        arrays = unrankSolvableArray(indices, size)
+        print("%-15s %.3f microseconds per board" % ("(array)", (timeit.default_timer() - startTime) / len(indices) * 1e6))
+
+#-----------------------------------------------------
@@ -0,0 +1,70 @@
+# SearchResult.py
+""" Outcome of one solve, returned by every searcher in EightPuzzle_Main.py
+"""
+
+from BoardClass import *
+
+class SearchResult():
+    """Outcome of one solve; true if the GOAL was found, so `if ASTAR(b):` still works.
+    Small and picklable: the path is kept as the cells the empty tile moved to."""
+
+    #=====================================================
+    def __init__(self, algorithm: str, path: list[int], explored: int, maxFrontier: int,
+                 duplicates: int, time: float, bound: float = 1.0) -> None:
+        """Constructor; path is None if the search failed. bound: the solution is at most
+        bound times longer than an optimal one (1.0 = optimal, inf = no guarantee)"""
+
+        self.Algorithm = algorithm
+        self.Path = path
+        self.Explored = explored
+        self.MaxFrontier = maxFrontier
+        self.Duplicates = duplicates
+        # seconds
+        self.Time = time
+        self.Bound = bound
+
+    #=====================================================
+    @property
+    def Solved(self) -> bool:
+        """True if the GOAL was found"""
+
+        return self.Path is not None
+
+    #=====================================================
+    @property
+    def Moves(self) -> int:
+        """Number of moves in the solution (-1 if not solved)"""
+
+        return len(self.Path) if self.Path is not None else -1
+
+    #=====================================================
+    def __bool__(self) -> bool:
+
+        return self.Solved
+
+    #=====================================================
+    def __repr__(self) -> str:
+
+        return "SearchResult(%s, solved=%s, moves=%d, explored=%d, time=%.3fms%s)" % (
+            self.Algorithm, self.Solved, self.Moves, self.Explored, self.Time * 1000,
+            ", bound=%.3f" % self.Bound if self.Bound != 1.0 else "")
+
+
+#=====================================================
+def pathOf(goalBoard: BoardClass) -> list[int]:
+    """Cells the empty tile moved to on the way from the start to goalBoard
+    (following its Trail back through the Arena); None if goalBoard is None"""
+
+    if goalBoard is None:
+        return None
+
+    path = []
+    blank = goalBoard.Blank
+    trail = goalBoard.Trail
+    while trail >= 0:
+        path.append(blank)
+        blank -= goalBoard.Size.MoveSteps[goalBoard.Arena.move(trail)]
+        trail = goalBoard.Arena.Parents[trail]
+    path.reverse()
+
+    return path
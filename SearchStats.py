@@ -0,0 +1,147 @@
+# SearchStats.py
+""" Buffered per-expansion statistics for the searchers
+
+The searchers used to time and FOUT.write() a csv line on every loop
+iteration. A SearchStats instead samples every Interval boards into a
+preallocated array('d') buffer and writes the whole thing once, when the
+search ends, as csv (the same layout as before) or as raw binary doubles.
+Disabled stats cost the searcher one int comparison per iteration:
+
+    if nextTry >= stats.Next: stats.record(nextTry, len(Q), ...)
+"""
+
+import math
+import struct
+import timeit
+from array import array
+
+# binary file header: magic, number of columns, number of rows
+# (followed by the title and the column names, one per line, then the rows as doubles)
+BINARY_HEADER = struct.Struct("<8sII")
+BINARY_MAGIC = b"8PSTATS\0"
+
+class SearchStats():
+    """Sampled search statistics, buffered in memory until flush()"""
+
+    #=====================================================
+    def __init__(self, path: str = None, interval: int = 1, binary: bool = False) -> None:
+        """Constructor; path None disables the stats. interval: record every interval-th board;
+        binary: write raw doubles (see readStats()) instead of csv"""
+
+        self.Path = path
+        self.Interval = max(1, interval)
+        self.Binary = binary
+
+        # set by start()
+        self.Title = ""
+        self.Columns = []
+        self.Formats = []
+        self.Width = 0
+
+        # next board number to sample (inf when disabled, so the check never passes)
+        self.Next = 0 if path is not None else math.inf
+
+        # preallocated row buffer (grown by doubling), rows used so far, summary lines
+        self.Data = array('d')
+        self.Rows = 0
+        self.Summary = []
+
+        self.StartTime = 0.0
+
+    #=====================================================
+    def start(self, title: str, columns: list[tuple]) -> 'SearchStats':
+        """Begin a search: columns are (name, format) pairs; a Time(milliseconds)
+        column is added at the end. Starts the timer"""
+
+        self.Title = title
+        self.Columns = [name for name, format in columns] + ["Time(milliseconds)"]
+        self.Formats = [format for name, format in columns] + ["%.12f"]
+        self.Width = len(self.Columns)
+        self.Rows = 0
+        self.Summary = []
+        if self.Path is not None:
+            self.Next = 0
+            self.Data = array('d', bytes(8 * self.Width * 1024))
+
+        self.StartTime = timeit.default_timer()
+
+        return self
+
+    #=====================================================
+    def record(self, boardNumber: int, *values) -> None:
+        """Buffer one row (board number, values..., elapsed time) and schedule the next sample"""
+
+        self.Next = boardNumber + self.Interval
+
+        base = self.Rows * self.Width
+        if base + self.Width > len(self.Data):
+            # out of room: double the buffer
+            self.Data.extend(array('d', bytes(8 * len(self.Data))))
+
+        self.Data[base] = boardNumber
+        self.Data[base + 1:base + self.Width - 1] = array('d', values)
+        self.Data[base + self.Width - 1] = (timeit.default_timer() - self.StartTime) * 1000
+        self.Rows += 1
+
+    #=====================================================
+    def summarize(self, name: str, value: int) -> None:
+        """Add a 'name: value' line to the end of the stats"""
+
+        self.Summary.append((name, value))
+
+    #=====================================================
+    def flush(self) -> None:
+        """Write everything buffered to Path (nothing if disabled)"""
+
+        if self.Path is None:
+            return
+
+        if self.Binary:
+            FOUT = open(self.Path, 'wb')
+            FOUT.write(BINARY_HEADER.pack(BINARY_MAGIC, self.Width, self.Rows))
+            FOUT.write(("\n".join([self.Title] + self.Columns) + "\n").encode())
+            self.Data[:self.Rows * self.Width].tofile(FOUT)
+            FOUT.close()
+            return
+
+        lineFormat = ",".join(self.Formats)
+        lines = [self.Title, ", ".join(self.Columns)]
+        for row in range(self.Rows):
+            base = row * self.Width
+            values = tuple(self.Data[base:base + self.Width])
+            lines.append(lineFormat % tuple(int(value) if format == "%d" else value
+                                            for format, value in zip(self.Formats, values)))
+        for name, value in self.Summary:
+            lines.append("%s: %d" % (name, value))
+
+        FOUT = open(self.Path, 'w')
+        FOUT.write("\n".join(lines) + "\n")
+        FOUT.close()
+
+
+#=====================================================
+def openStats(statsFile, title: str, columns: list[tuple]) -> SearchStats:
+    """Searcher helper: every searcher's statsFile= may be a csv path, None (disabled)
+    or a configured SearchStats (to sample or write binary); returns it started with title and columns"""
+
+    if not isinstance(statsFile, SearchStats):
+        statsFile = SearchStats(statsFile)
+
+    return statsFile.start(title, columns)
+
+#=====================================================
+def readStats(path: str) -> tuple:
+    """Read a binary stats file: returns (title, column names, list of rows)"""
+
+    FIN = open(path, 'rb')
+    magic, width, rows = BINARY_HEADER.unpack(FIN.read(BINARY_HEADER.size))
+    if magic != BINARY_MAGIC:
+        FIN.close()
+        raise ValueError("%s is not a binary stats file" % path)
+
+    names = [FIN.readline().decode().rstrip("\n") for i in range(width + 1)]
+    data = array('d')
+    data.fromfile(FIN, width * rows)
+    FIN.close()
+
+    return names[0], names[1:], [list(data[row * width:(row + 1) * width]) for row in range(rows)]
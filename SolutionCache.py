@@ -0,0 +1,181 @@
+# SolutionCache.py
+""" Cache of solved boards in front of the searchers
+
+Solutions are kept as the cells the empty tile moved to (SearchResult.Path),
+keyed by the packed board, its GOAL, the searcher and the heuristic. The
+most recently used ones stay in memory (a bounded LRU); with a path they are
+also stored in a sqlite file, so they survive between runs.
+
+Every suffix of an optimal path is itself an optimal path, so when an
+optimal searcher solves a board, every board along its path is cached too.
+Only optimal searchers (OPTIMAL) are cached: the others' paths depend on
+more than the key (ANYTIME's deadline and weight, say), and a cached one
+could be handed out as something it isn't.
+"""
+
+import os
+import timeit
+from collections import OrderedDict
+from BoardClass import *
+from SearchResult import SearchResult
+from SolutionWriter import solutionWriter
+
+# default location of the on-disk store (next to this file)
+CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "EightPuzzleSolutions.sqlite")
+
+# searchers whose solutions are optimal (the only ones cached, sub-paths included)
+OPTIMAL = ('ASTAR', 'IDASTAR', 'BIDIRECTIONAL', 'SMASTAR', 'HDASTAR', 'DatabaseSearch')
+
+# searchers that use a heuristic (the heuristic is part of their key)
+INFORMED = ('ASTAR', 'BestFS', 'IDASTAR', 'BIDIRECTIONAL', 'SMASTAR', 'ANYTIME', 'HDASTAR')
+
+class SolutionCache():
+    """Bounded LRU of solutions, optionally backed by a sqlite file"""
+
+    #=====================================================
+    def __init__(self, capacity: int = 100000, path: str = None) -> None:
+        """Constructor; capacity: most solutions kept in memory;
+        path: sqlite file to persist solutions to (None keeps them in memory only)"""
+
+        self.Capacity = capacity
+        self.Path = path
+
+        # key -> path, least recently used first
+        self.Memory = OrderedDict()
+
+        self.Database = None
+        if path is not None:
+            import sqlite3
+            # (callers sharing the cache between threads serialize their calls, see SolverService)
+            self.Database = sqlite3.connect(path, check_same_thread=False)
+            self.Database.execute("CREATE TABLE IF NOT EXISTS solutions (key TEXT PRIMARY KEY, path BLOB)")
+
+        # metrics
+        self.Hits = 0
+        self.DiskHits = 0
+        self.Misses = 0
+        self.Stores = 0
+        self.Evictions = 0
+
+    #=====================================================
+    def key(self, board: BoardClass, algorithm: str, heuristic: str = None) -> str:
+        """Cache key of board solved by algorithm (and heuristic, default the active one)"""
+
+        if algorithm not in INFORMED:
+            heuristic = ''
+        elif heuristic is None:
+            heuristic = board.Size.ActiveHeuristic.Name
+
+        return "%d:%d:%d:%s:%s" % (board.Size.N, board.Size.GoalState, board.State, algorithm, heuristic)
+
+    #=====================================================
+    def get(self, board: BoardClass, algorithm: str, heuristic: str = None) -> list[int]:
+        """Cached path of board (None on a miss, or if algorithm isn't OPTIMAL)"""
+
+        if algorithm not in OPTIMAL:
+            return None
+
+        key = self.key(board, algorithm, heuristic)
+
+        path = self.Memory.get(key)
+        if path is not None:
+            self.Memory.move_to_end(key)
+            self.Hits += 1
+            return path
+
+        if self.Database is not None:
+            row = self.Database.execute("SELECT path FROM solutions WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                path = list(row[0])
+                self.remember(key, path)
+                self.Hits += 1
+                self.DiskHits += 1
+                return path
+
+        self.Misses += 1
+        return None
+
+    #=====================================================
+    def put(self, board: BoardClass, algorithm: str, heuristic: str, path: list[int], bound: float = 1.0) -> None:
+        """Cache path as the solution of board, and the rest of the path for every board along it
+        (bound: SearchResult.Bound; only proven optimal paths of OPTIMAL algorithms are cached)"""
+
+        if path is None or algorithm not in OPTIMAL or bound != 1.0:
+            return
+
+        entries = [(self.key(board, algorithm, heuristic), path)]
+
+        # replay the moves: what is left of the path is optimal for each board on it
+        currentNode = board.copyCTOR()
+        for i in range(len(path)):
+            currentNode.moveBlank(path[i])
+            entries.append((self.key(currentNode, algorithm, heuristic), path[i + 1:]))
+
+        for key, rest in entries:
+            self.remember(key, rest)
+        self.Stores += len(entries)
+
+        if self.Database is not None:
+            # the path is stored as one byte per move (cells are < 256)
+            self.Database.executemany("INSERT OR REPLACE INTO solutions VALUES (?, ?)",
+                                      [(key, bytes(rest)) for key, rest in entries])
+            self.Database.commit()
+
+    #=====================================================
+    def remember(self, key: str, path: list[int]) -> None:
+        """Put an entry in the in-memory LRU, evicting the least recently used one if full"""
+
+        self.Memory[key] = path
+        self.Memory.move_to_end(key)
+        while len(self.Memory) > self.Capacity:
+            self.Memory.popitem(last=False)
+            self.Evictions += 1
+
+    #=====================================================
+    def solve(self, board: BoardClass, algorithm: str, heuristic: str = None, **kwargs) -> SearchResult:
+        """Answer from the cache, or run the named searcher (of EightPuzzle_Main.py,
+        with kwargs) and cache its solution (if algorithm is OPTIMAL). A hit explores 0 boards"""
+
+        startTime = timeit.default_timer()
+
+        path = self.get(board, algorithm, heuristic)
+        if path is not None:
+            print("CACHE: Solution found! (%d moves)" % len(path))
+            solutionWriter(kwargs.get('output')).write(board, path, algorithm)
+            return SearchResult(algorithm, list(path), 0, 0, 0, timeit.default_timer() - startTime)
+
+        import EightPuzzle_Main
+
+        if algorithm in INFORMED:
+            kwargs['heuristic'] = heuristic
+        result = getattr(EightPuzzle_Main, algorithm)(board, **kwargs)
+        self.put(board, algorithm, heuristic, result.Path, result.Bound)
+
+        return result
+
+    #=====================================================
+    def hitRate(self) -> float:
+        """Fraction of lookups answered from the cache"""
+
+        lookups = self.Hits + self.Misses
+        return self.Hits / lookups if lookups else 0.0
+
+    #=====================================================
+    def close(self) -> None:
+        """Close the on-disk store"""
+
+        if self.Database is not None:
+            self.Database.close()
+            self.Database = None
+
+    #=====================================================
+    def __len__(self) -> int:
+        """Number of solutions in memory"""
+
+        return len(self.Memory)
+
+    #=====================================================
+    def __repr__(self) -> str:
+
+        return "SolutionCache(hits=%d (disk %d), misses=%d, hit rate=%.1f%%, stored=%d, evicted=%d)" % (
+            self.Hits, self.DiskHits, self.Misses, self.hitRate() * 100, self.Stores, self.Evictions)
@@ -0,0 +1,110 @@
+# SolutionWriter.py
+""" Solution output for the searchers
+
+A solution is replayed from the starting board and streamed through one
+buffered writer in one of the MODES:
+    'pretty'  every board of the path, drawn as a grid (the original output)
+    'moves'   one compact line of the empty tile's moves, e.g. "URDL..."
+    'json'    one JSON object per line for every step of the path
+    'none'    nothing
+"""
+
+import sys
+from BoardClass import *
+
+MODES = ('pretty', 'moves', 'json', 'none')
+
+# letter of each move code (the way the empty tile moves: UP, RIGHT, DOWN, LEFT)
+MOVE_LETTERS = "URDL"
+
+class SolutionWriter():
+    """Writes solutions to a stream (default sys.stdout), buffering up to BufferSize characters"""
+
+    #=====================================================
+    def __init__(self, mode: str = 'pretty', stream=None, bufferSize: int = 1 << 16) -> None:
+        """Constructor; stream None writes to whatever sys.stdout is at the time"""
+
+        if mode not in MODES:
+            raise ValueError("unknown output mode: %s (choose from %s)" % (mode, ", ".join(MODES)))
+
+        self.Mode = mode
+        self.Stream = stream
+        self.BufferSize = bufferSize
+
+        self.Buffer = []
+        self.Buffered = 0
+
+    #=====================================================
+    def emit(self, text: str) -> None:
+        """Buffer text, writing the buffer out once it is full"""
+
+        self.Buffer.append(text)
+        self.Buffered += len(text)
+        if self.Buffered >= self.BufferSize:
+            self.flush()
+
+    #=====================================================
+    def flush(self) -> None:
+        """Write out everything buffered"""
+
+        if self.Buffer:
+            stream = self.Stream if self.Stream is not None else sys.stdout
+            stream.write("".join(self.Buffer))
+            stream.flush()
+            self.Buffer = []
+            self.Buffered = 0
+
+    #=====================================================
+    def write(self, startingBoard: BoardClass, path: list[int], algorithm: str = "") -> None:
+        """Stream the solution path (cells the empty tile moved to) from startingBoard"""
+
+        if self.Mode == 'none' or path is None:
+            return
+
+        if self.Mode == 'moves':
+            self.emit("Moves (%d): %s\n" % (len(path), moveString(startingBoard, path)))
+            self.flush()
+            return
+
+        board = startingBoard.copyCTOR()
+        letters = moveString(startingBoard, path)
+
+        if self.Mode == 'pretty':
+            self.emit("Path: \n\n")
+            self.emit(str(board) + "\n\n")
+            for target in path:
+                board.moveBlank(target)
+                self.emit(str(board) + "\n\n")
+        else:
+            import json
+            self.emit(json.dumps({"algorithm": algorithm, "step": 0, "move": None, "tiles": board.tiles()}) + "\n")
+            for step, target in enumerate(path):
+                board.moveBlank(target)
+                self.emit(json.dumps({"algorithm": algorithm, "step": step + 1, "move": letters[step],
+                                      "tiles": board.tiles()}) + "\n")
+
+        self.flush()
+
+
+#=====================================================
+def moveString(startingBoard: BoardClass, path: list[int]) -> str:
+    """The path as letters, one per move of the empty tile: U(p), R(ight), D(own), L(eft)"""
+
+    letters = []
+    blank = startingBoard.Blank
+    codes = startingBoard.Size.MoveCodes
+    for target in path:
+        letters.append(MOVE_LETTERS[codes[target - blank]])
+        blank = target
+
+    return "".join(letters)
+
+#=====================================================
+def solutionWriter(output) -> SolutionWriter:
+    """Searcher helper: every searcher's output= may be a SolutionWriter, a mode name
+    (see MODES) or None (pretty)"""
+
+    if isinstance(output, SolutionWriter):
+        return output
+
+    return SolutionWriter(output if output is not None else 'pretty')
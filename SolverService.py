@@ -0,0 +1,432 @@
+# SolverService.py
+""" Long-lived solver: JSON-lines requests in, solutions and stats out
+
+One process keeps a pool of warm workers (imported searchers, built
+heuristic tables) and a SolutionCache, and answers one JSON object per
+line, read from stdin or from the clients of a Unix socket:
+
+    {"id": 1, "board": [[1, 2, 0], [3, 4, 5], [6, 7, 8]], "algorithm": "ASTAR",
+     "heuristic": "manhattan", "deadline": 2.0}
+
+"board" may also be a flat list of tiles, or "state" a packed State with
+"N"; everything but the board is optional (ASTAR, the default heuristic,
+the service's maxDeadline). Every request gets one reply line, in the order the solves
+finish, carrying the request's id:
+
+    {"id": 1, "solved": true, "moves": 2, "solution": "LL", "path": [1, 0],
+     "explored": 3, "max_frontier": 4, "duplicates": 0, "time_ms": 0.2,
+     "bound": 1.0, "cached": false}
+
+or {"id": 1, "error": "..."}. A deadline is passed on to ANYTIME (which
+answers its best solution by then), IDASTAR and SMASTAR (which give up,
+unsolved, and free their worker); any other searcher that overruns it is
+answered with an error (and its late solution is still cached). No
+deadline may be longer than maxDeadline, so no solve holds a worker for
+good. Boards
+are 2x2 up to MAX_N x MAX_N. {"command": "stats"} answers the service's
+counters. At most maxPending solves are in flight: past that, reading
+stops until one finishes (backpressure onto the client).
+
+    python SolverService.py [workers]                  serve stdin/stdout
+    python SolverService.py --socket PATH [workers]    serve a Unix socket
+"""
+
+import io
+import json
+import math
+import multiprocessing
+import os
+import signal
+import socketserver
+import sys
+import threading
+import timeit
+from BoardClass import *
+from BatchSolve import ALGORITHMS, initWorker
+from Heuristics import HEURISTICS
+from SearchResult import SearchResult
+from SolutionCache import SolutionCache
+from SolutionWriter import moveString
+
+# widest board a request may ask for
+MAX_N = 5
+
+# default maxDeadline: longest a solve may run (seconds)
+MAX_DEADLINE = 10.0
+
+# searchers that take the request's deadline themselves (the service times out the others)
+DEADLINES = ('ANYTIME', 'IDASTAR', 'SMASTAR')
+
+class SolverService():
+    """Worker pool, solution cache and counters shared by every client"""
+
+    #=====================================================
+    def __init__(self, workers: int = None, maxPending: int = None, cacheCapacity: int = 100000,
+                 cachePath: str = None, maxDeadline: float = MAX_DEADLINE) -> None:
+        """Constructor; workers: pool size (default one per core); maxPending: most solves
+        in flight (default 4 per worker); cachePath: sqlite file of the cache (None: memory only);
+        maxDeadline: seconds a solve may take, the deadline of requests that give none"""
+
+        self.Workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.MaxPending = maxPending if maxPending is not None else 4 * self.Workers
+        self.MaxDeadline = maxDeadline
+
+        self.Pool = multiprocessing.Pool(self.Workers, initializer=warmWorker)
+        self.Cache = SolutionCache(cacheCapacity, cachePath)
+
+        # one lock for the cache and counters (pool callbacks come in on another thread)
+        self.Lock = threading.Lock()
+        self.Slots = threading.BoundedSemaphore(self.MaxPending)
+        self.Idle = threading.Condition(self.Lock)
+
+        # counters
+        self.Pending = 0
+        self.Requests = 0
+        self.Solved = 0
+        self.Errors = 0
+        self.TimedOut = 0
+        self.StartTime = timeit.default_timer()
+
+    #=====================================================
+    def handle(self, line: str, reply) -> None:
+        """Answer one request line; reply(dict) sends a reply line (maybe later, from another thread).
+        Blocks while maxPending solves are in flight"""
+
+        line = line.strip()
+        if not line:
+            return
+
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("a request is a JSON object")
+        except (ValueError, RecursionError) as error:
+            self.fail(None, reply, "bad request: %s" % error)
+            return
+
+        if request.get('command') == 'stats':
+            reply(dict(self.stats(), id=request.get('id')))
+            return
+
+        try:
+            board = parseBoard(request)
+            algorithm = request.get('algorithm', 'ASTAR')
+            if algorithm not in ALGORITHMS:
+                raise ValueError("unknown algorithm: %s (choose from %s)" % (algorithm, ", ".join(ALGORITHMS)))
+            heuristic = request.get('heuristic') or BoardClass.HeuristicName
+            if not isinstance(heuristic, str) or heuristic not in HEURISTICS:
+                raise ValueError("unknown heuristic: %s (choose from %s)" % (heuristic, ", ".join(HEURISTICS)))
+            deadline = request.get('deadline')
+            if deadline is not None and not (isinstance(deadline, (int, float)) and not isinstance(deadline, bool)
+                                             and 0 < deadline < math.inf):
+                raise ValueError("deadline must be a positive number of seconds")
+            deadline = min(deadline, self.MaxDeadline) if deadline is not None else self.MaxDeadline
+        except (ValueError, TypeError) as error:
+            self.fail(request.get('id'), reply, str(error))
+            return
+        except Exception as error:
+            # whatever else a malformed request trips over, it only fails that request
+            self.fail(request.get('id'), reply, "bad request: %s" % error)
+            return
+
+        if not board.isSolvable():
+            self.fail(request.get('id'), reply, "board can't reach the GOAL")
+            return
+
+        with self.Lock:
+            self.Requests += 1
+            path = self.Cache.get(board, algorithm, heuristic)
+        if path is not None:
+            result = SearchResult(algorithm, list(path), 0, 0, 0, 0.0)
+            self.answer(request.get('id'), reply, board, result, True)
+            return
+
+        self.submit(request.get('id'), reply, board, algorithm, heuristic, deadline)
+
+    #=====================================================
+    def submit(self, id, reply, board: BoardClass, algorithm: str, heuristic: str, deadline: float) -> None:
+        """Send a solve to the pool (waiting for a free slot), answering when it finishes or its deadline passes"""
+
+        self.Slots.acquire()
+        with self.Lock:
+            self.Pending += 1
+
+        # the first of the result and the deadline answers the request
+        answered = threading.Event()
+        timer = None
+
+        def done(value: tuple) -> None:
+            worker, result = value
+            with self.Lock:
+                self.Cache.put(board, algorithm, heuristic, result.Path, result.Bound)
+            if timer is not None:
+                timer.cancel()
+            if not answered.is_set():
+                answered.set()
+                self.answer(id, reply, board, result, False)
+            self.release()
+
+        def failed(error: BaseException) -> None:
+            if timer is not None:
+                timer.cancel()
+            if not answered.is_set():
+                answered.set()
+                self.fail(id, reply, "solve failed: %s" % error)
+            self.release()
+
+        def overdue() -> None:
+            if not answered.is_set():
+                answered.set()
+                with self.Lock:
+                    self.TimedOut += 1
+                self.fail(id, reply, "deadline of %g seconds passed" % deadline)
+
+        kwargs = {}
+        if algorithm in DEADLINES:
+            kwargs['deadline'] = deadline
+        else:
+            timer = threading.Timer(deadline, overdue)
+            timer.daemon = True
+            timer.start()
+
+        self.Pool.apply_async(solveRequest, ((board.Size.N, board.State), algorithm, heuristic, kwargs),
+                              callback=done, error_callback=failed)
+
+    #=====================================================
+    def release(self) -> None:
+        """A solve finished: free its slot"""
+
+        with self.Lock:
+            self.Pending -= 1
+            self.Idle.notify_all()
+        self.Slots.release()
+
+    #=====================================================
+    def answer(self, id, reply, board: BoardClass, result: SearchResult, cached: bool) -> None:
+        """Send the reply line of a finished solve"""
+
+        with self.Lock:
+            self.Solved += result.Solved
+
+        reply({
+            'id': id,
+            'algorithm': result.Algorithm,
+            'solved': result.Solved,
+            'moves': result.Moves,
+            'solution': moveString(board, result.Path) if result.Solved else None,
+            'path': result.Path,
+            'explored': result.Explored,
+            'max_frontier': result.MaxFrontier,
+            'duplicates': result.Duplicates,
+            'time_ms': result.Time * 1000,
+            'bound': result.Bound if result.Solved and result.Bound != math.inf else None,
+            'cached': cached,
+        })
+
+    #=====================================================
+    def fail(self, id, reply, message: str) -> None:
+        """Send an error reply line"""
+
+        with self.Lock:
+            self.Errors += 1
+
+        reply({'id': id, 'error': message})
+
+    #=====================================================
+    def stats(self) -> dict:
+        """The service's counters"""
+
+        with self.Lock:
+            return {
+                'workers': self.Workers,
+                'pending': self.Pending,
+                'requests': self.Requests,
+                'solved': self.Solved,
+                'errors': self.Errors,
+                'timed_out': self.TimedOut,
+                'cache_hits': self.Cache.Hits,
+                'cache_hit_rate': self.Cache.hitRate(),
+                'uptime_s': timeit.default_timer() - self.StartTime,
+            }
+
+    #=====================================================
+    def drain(self) -> None:
+        """Wait for every solve in flight to finish"""
+
+        with self.Lock:
+            while self.Pending:
+                self.Idle.wait()
+
+    #=====================================================
+    def close(self) -> None:
+        """Finish the solves in flight and stop the pool"""
+
+        self.drain()
+        self.Pool.close()
+        self.Pool.join()
+        self.Cache.close()
+
+
+#=====================================================
+def warmWorker() -> None:
+    """Pool initializer: silence the searchers and load them (and the default tables) once;
+    Ctrl-C is left to the service, which shuts the pool down itself"""
+
+    initWorker(None)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    import EightPuzzle_Main
+    for N in (3, 4):
+        BoardClass.getSize(N)
+
+#=====================================================
+def solveRequest(encoded: tuple, algorithm: str, heuristic: str, kwargs: dict) -> tuple:
+    """Worker: solve one (N, State) board; returns (worker pid, SearchResult)"""
+
+    import EightPuzzle_Main
+
+    N, state = encoded
+    BoardClass.useHeuristic(heuristic)
+    board = BoardClass.fromState(state, N)
+
+    result = getattr(EightPuzzle_Main, algorithm)(board, statsFile=None, output='none', **kwargs)
+
+    return os.getpid(), result
+
+#=====================================================
+def isInteger(value) -> bool:
+    """True for a JSON integer (an int, but not a bool)"""
+
+    return isinstance(value, int) and not isinstance(value, bool)
+
+#=====================================================
+def parseBoard(request: dict) -> BoardClass:
+    """The starting board of a request: "board" (rows or a flat list of tiles) or "state" and "N"
+    (raises ValueError if it isn't a board)"""
+
+    if 'board' in request:
+        tiles = request['board']
+        if not isinstance(tiles, list):
+            raise ValueError("board must be a list of rows or of tiles")
+        if tiles and all(isinstance(row, list) for row in tiles):
+            tiles = [tile for row in tiles for tile in row]
+        if not all(isInteger(tile) for tile in tiles):
+            raise ValueError("board tiles must be ints")
+        N = math.isqrt(len(tiles))
+        if not 2 <= N <= MAX_N or N * N != len(tiles) or sorted(tiles) != list(range(N * N)):
+            raise ValueError("board must hold the tiles 0..N^2-1 of an NxN board (2 <= N <= %d)" % MAX_N)
+        board = BoardClass(N)
+        board.Board = [tiles[row * N:(row + 1) * N] for row in range(N)]
+        return BoardClass.fromState(board.State, N)
+
+    if 'state' in request:
+        N = request.get('N', BoardClass.N)
+        if not isInteger(N) or not 2 <= N <= MAX_N:
+            raise ValueError("N must be an int from 2 to %d" % MAX_N)
+        state = request['state']
+        if not isInteger(state):
+            raise ValueError("state must be an int")
+        size = BoardClass.getSize(N)
+        if not 0 <= state < 1 << (size.BITS * size.NN):
+            raise ValueError("state is not a packed %dx%d board" % (N, N))
+        board = BoardClass.fromState(state, N)
+        if sorted(board.tiles()) != list(range(N * N)):
+            raise ValueError("state is not a packed %dx%d board" % (N, N))
+        return board
+
+    raise ValueError("a request needs a board or a state")
+
+class LineWriter():
+    """reply() for a text stream: one JSON line per reply, whole lines at a time across threads"""
+
+    #=====================================================
+    def __init__(self, stream) -> None:
+        """Constructor; stream: where the reply lines go"""
+
+        self.Stream = stream
+        self.Sent = 0
+        self.Lock = threading.Condition()
+
+    #=====================================================
+    def __call__(self, message: dict) -> None:
+
+        with self.Lock:
+            try:
+                self.Stream.write(json.dumps(message) + "\n")
+                self.Stream.flush()
+            except (OSError, ValueError):
+                # the client went away
+                pass
+            self.Sent += 1
+            self.Lock.notify_all()
+
+    #=====================================================
+    def waitFor(self, count: int) -> None:
+        """Wait until count replies have been sent"""
+
+        with self.Lock:
+            while self.Sent < count:
+                self.Lock.wait()
+
+
+#=====================================================
+def serveStream(service: SolverService, FIN, FOUT) -> None:
+    """Answer the request lines of FIN on FOUT until FIN ends"""
+
+    reply = LineWriter(FOUT)
+    for line in FIN:
+        service.handle(line, reply)
+    service.drain()
+
+#=====================================================
+def serveSocket(service: SolverService, path: str) -> None:
+    """Answer clients of a Unix socket at path, one thread per connection, until interrupted"""
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            reply = LineWriter(io.TextIOWrapper(self.wfile, encoding='utf-8'))
+            requests = 0
+            for line in self.rfile:
+                line = line.decode()
+                if line.strip():
+                    requests += 1
+                service.handle(line, reply)
+            # every request gets its reply before the connection closes
+            reply.waitFor(requests)
+
+    class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+    if os.path.exists(path):
+        os.unlink(path)
+
+    with Server(path, Handler) as server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    os.unlink(path)
+
+#-----------\
+# START HERE \
+#-----------------------------------------------------------
+if __name__ == '__main__':
+    arguments = sys.argv[1:]
+    socketPath = None
+    if arguments[:1] == ['--socket']:
+        socketPath = arguments[1]
+        arguments = arguments[2:]
+    workers = int(arguments[0]) if arguments else None
+
+    # the searchers print progress: keep stdout for replies only
+    replies = sys.stdout
+    sys.stdout = sys.stderr
+
+    service = SolverService(workers)
+    if socketPath is not None:
+        serveSocket(service, socketPath)
+    else:
+        serveStream(service, sys.stdin, replies)
+    service.close()
+
+#-----------------------------------------------------
@@ -0,0 +1,193 @@
+# StateDatabase.py
+""" Exact distance-to-GOAL of every reachable 8puzzle board, stored on disk
+
+Only 9!/2 = 181,440 boards can reach the GOAL, so a backwards BFS from the
+GOAL can record the exact number of moves for all of them, one byte per
+board, indexed by the rank of the board's permutation (rankTiles()). The
+file is memory mapped at run time and a board is solved by always sliding
+to a child one move closer (O(depth) lookups, no search).
+
+Build it once with:   python StateDatabase.py
+"""
+
+import mmap
+import os
+import struct
+import time
+import zlib
+from collections import deque
+from BoardClass import *
+from Ranking import rankSolvable
+
+# default location of the table (next to this file)
+DATABASE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "EightPuzzleStates.db")
+
+# file header: magic, format version, N, packed GOAL, number of entries, crc32 of the entries
+HEADER = struct.Struct("<8sHHQII")
+MAGIC = b"8PUZZDB\0"
+VERSION = 2
+
+# distance byte of boards that can't reach the GOAL (never stored for solvable boards)
+UNREACHABLE = 255
+
+# what a reader can see while another process rewrites the table: retried before rebuilding
+RETRYABLE = ("truncated", "checksum mismatch")
+RETRIES = 5
+RETRY_DELAY = 0.05
+
+# 0! .. 9!
+FACTORIAL = [1, 1, 2, 6, 24, 120, 720, 5040, 40320, 362880]
+
+
+#=====================================================
+def rankTiles(arr: list[int]) -> int:
+    """Dense index of a 3x3 board (flat list of tiles) among the boards that can reach
+    the GOAL (Ranking.rankSolvable(), linear time)"""
+
+    return rankSolvable(arr, BoardClass.getSize(3))
+
+
+#=====================================================
+def buildStateDatabase(path: str = DATABASE_FILE) -> None:
+    """Retrograde BFS from the 3x3 GOAL, writing the distance of every
+    reachable board to path (indexed by rankTiles()); the table is written to
+    a temporary file next to path and renamed over it, so readers only ever
+    see a whole table"""
+
+    import tempfile
+
+    size = BoardClass.getSize(3)
+    distances = bytearray([UNREACHABLE]) * (FACTORIAL[size.NN] // 2)
+
+    goal = tuple(tile for row in size.GOAL for tile in row)
+    distances[rankTiles(goal)] = 0
+    Q = deque([(goal, goal.index(0))])
+
+    while Q:
+        arr, blank = Q.popleft()
+        nextDistance = distances[rankTiles(arr)] + 1
+
+        for target in size.Neighbors[blank]:
+            child = list(arr)
+            child[blank], child[target] = child[target], 0
+            rank = rankTiles(child)
+            if distances[rank] == UNREACHABLE:
+                distances[rank] = nextDistance
+                Q.append((tuple(child), target))
+
+    descriptor, tempPath = tempfile.mkstemp(prefix=os.path.basename(path) + ".",
+                                            dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        with os.fdopen(descriptor, "wb") as FOUT:
+            FOUT.write(HEADER.pack(MAGIC, VERSION, size.N, size.GoalState,
+                                   len(distances), zlib.crc32(distances)))
+            FOUT.write(distances)
+        os.replace(tempPath, path)
+    except BaseException:
+        os.remove(tempPath)
+        raise
+
+
+class StateDatabase():
+    """Memory mapped view of a file written by buildStateDatabase()"""
+
+    #=====================================================
+    def __init__(self, path: str = DATABASE_FILE, rebuild: bool = True) -> None:
+        """Map the table at path; a missing or stale table (other version,
+        GOAL or a bad checksum) is rebuilt if rebuild, else raises ValueError.
+        A truncated table or bad checksum is first retried a few times, in case
+        another process (writing it in place) is still at it"""
+
+        self.Path = path
+        self.Map = None
+
+        problem = self.open()
+        for attempt in range(RETRIES):
+            if problem not in RETRYABLE:
+                break
+            time.sleep(RETRY_DELAY)
+            problem = self.open()
+
+        if problem is not None:
+            if not rebuild:
+                raise ValueError("state database %s: %s" % (path, problem))
+            buildStateDatabase(path)
+            problem = self.open()
+            assert problem is None, problem
+
+    #=====================================================
+    def open(self) -> str:
+        """Map the file and check its header; returns what is wrong with it (None if ok)"""
+
+        try:
+            FIN = open(self.Path, "rb")
+        except FileNotFoundError:
+            return "missing"
+
+        with FIN:
+            if os.fstat(FIN.fileno()).st_size < HEADER.size:
+                return "truncated"
+            Map = mmap.mmap(FIN.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, N, goalState, count, crc = HEADER.unpack_from(Map, 0)
+        if magic != MAGIC or version != VERSION:
+            problem = "wrong format version"
+        elif N != 3 or goalState != BoardClass.getSize(3).GoalState:
+            problem = "built for a different GOAL"
+        elif len(Map) != HEADER.size + count or zlib.crc32(Map[HEADER.size:]) != crc:
+            problem = "checksum mismatch"
+        else:
+            self.Map = Map
+            return None
+
+        Map.close()
+        return problem
+
+    #=====================================================
+    def close(self) -> None:
+        """Unmap the table"""
+
+        if self.Map is not None:
+            self.Map.close()
+            self.Map = None
+
+    #=====================================================
+    def distance(self, board: BoardClass) -> int:
+        """Exact number of moves from board to the GOAL (UNREACHABLE if unsolvable)"""
+
+        if board.Size.N != 3:
+            raise ValueError("the state database only covers the 3x3 (8) puzzle")
+
+        if not board.isSolvable():
+            return UNREACHABLE
+
+        return self.Map[HEADER.size + rankTiles(board.tiles())]
+
+    #=====================================================
+    def solve(self, startingBoard: BoardClass) -> BoardClass:
+        """Optimal path by greedy descent: returns the GOAL board, linked back
+        to startingBoard through Parent (None if the board is unsolvable)"""
+
+        currentNode = startingBoard
+        remaining = self.distance(currentNode)
+        if remaining == UNREACHABLE:
+            return None
+
+        while remaining > 0:
+            for child in currentNode.createChildrenBoards():
+                if self.Map[HEADER.size + rankTiles(child.tiles())] == remaining - 1:
+                    currentNode = child
+                    break
+            remaining -= 1
+
+        return currentNode
+
+
+#-----------\
+# START HERE \
+#-----------------------------------------------------------
+if __name__ == '__main__':
+    buildStateDatabase()
+    print("Wrote %s" % DATABASE_FILE)
+
+#-----------------------------------------------------
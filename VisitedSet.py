@@ -0,0 +1,114 @@
+# VisitedSet.py
+""" Closed set (visited list) for the 8puzzle searchers
+"""
+
+from BoardClass import *
+
+class VisitedSet():
+    """Hash indexed set of visited Boards, keyed on BoardClass.boardKey()
+    (only the keys are kept, so visited boards can be freed)"""
+
+    #=====================================================
+    def __init__(self, size: BoardSize = None) -> None:
+        """Constructor to initialize an empty visited set (size: unused, as BitsetVisitedSet's)"""
+
+        # hash set of boardKeys
+        self.Index = set()
+
+        # number of boards rejected because they were already visited
+        self.Duplicates = 0
+
+    #=====================================================
+    def add(self, board: BoardClass) -> None:
+        """Mark a board as visited"""
+
+        self.Index.add(board.boardKey())
+
+    #=====================================================
+    def seen(self, board: BoardClass) -> bool:
+        """Check if a board has been visited before; counts the duplicate if so"""
+
+        if board.boardKey() in self.Index:
+            self.Duplicates += 1
+            return True
+
+        return False
+
+    #=====================================================
+    def __contains__(self, board: BoardClass) -> bool:
+
+        return board.boardKey() in self.Index
+
+    #=====================================================
+    def __len__(self) -> int:
+
+        return len(self.Index)
+
+
+class BitsetVisitedSet():
+    """Visited set of one bit per solvable board, indexed by Ranking.rankSolvable()
+    (the same interface as VisitedSet; (N^2)!/2 bits, so for 3x3 boards and smaller)"""
+
+    #=====================================================
+    def __init__(self, size: BoardSize = None) -> None:
+        """Constructor to initialize an empty visited set for boards of size (default the default size)"""
+
+        # (imported here: the hash VisitedSet doesn't need Ranking at startup)
+        from Ranking import rankSolvable, solvableCount
+
+        self.Size = size if size is not None else BoardClass.getSize()
+        if self.Size.NN > 9:
+            raise ValueError("a bitset of all %dx%d boards is too large" % (self.Size.N, self.Size.N))
+
+        # dense index of a board's tiles, see Ranking.rankSolvable()
+        self.RankSolvable = rankSolvable
+
+        self.Bits = bytearray((solvableCount(self.Size) + 7) // 8)
+        self.Count = 0
+
+        # number of boards rejected because they were already visited
+        self.Duplicates = 0
+
+    #=====================================================
+    def rank(self, board: BoardClass) -> int:
+        """Bit index of a board"""
+
+        return self.RankSolvable(board.tiles(), self.Size)
+
+    #=====================================================
+    def add(self, board: BoardClass) -> None:
+        """Mark a board as visited"""
+
+        rank = self.rank(board)
+        bit = 1 << (rank & 7)
+        if not self.Bits[rank >> 3] & bit:
+            self.Bits[rank >> 3] |= bit
+            self.Count += 1
+
+    #=====================================================
+    def seen(self, board: BoardClass) -> bool:
+        """Check if a board has been visited before; counts the duplicate if so"""
+
+        if board in self:
+            self.Duplicates += 1
+            return True
+
+        return False
+
+    #=====================================================
+    def __contains__(self, board: BoardClass) -> bool:
+
+        rank = self.rank(board)
+        return bool(self.Bits[rank >> 3] & (1 << (rank & 7)))
+
+    #=====================================================
+    def __len__(self) -> int:
+
+        return self.Count
+
+
+# name -> visited set class, for the visited= argument of ASTAR/BestFS/DepthFS
+VISITED_SETS = {
+    'hash': VisitedSet,
+    'bitset': BitsetVisitedSet,
+}
@@ -0,0 +1,102 @@
+# test_Ranking.py
+""" Round trip tests of Ranking.py's perfect hashing (run with:   python -m pytest)
+"""
+
+import itertools
+import math
+import random
+import pytest
+from BoardClass import *
+from Ranking import (rankPermutation, unrankPermutation, permutationParity, lehmerRank,
+                     solvableCount, rankSolvable, unrankSolvable, unrankSolvableArray)
+
+
+#=====================================================
+@pytest.mark.parametrize("n", range(1, 7))
+def test_permutation_round_trip(n: int) -> None:
+    """Every permutation of 0..n-1 gets its own rank in 0..n!-1, and unranks back to itself"""
+
+    ranks = set()
+    for perm in itertools.permutations(range(n)):
+        rank = rankPermutation(perm)
+        assert 0 <= rank < math.factorial(n)
+        assert unrankPermutation(rank, n) == list(perm)
+        ranks.add(rank)
+
+    assert len(ranks) == math.factorial(n)
+
+#=====================================================
+@pytest.mark.parametrize("n", range(1, 7))
+def test_permutation_parity(n: int) -> None:
+    """permutationParity() agrees with the parity of the inversions (the Lehmer code's digit sum)"""
+
+    for rank in range(math.factorial(n)):
+        perm = unrankPermutation(rank, n)
+        inversions = sum(1 for i in range(n) for j in range(i + 1, n) if perm[i] > perm[j])
+        assert permutationParity(rank, n) == inversions % 2
+
+    # the Lehmer code ranks in lexicographic order
+    assert [lehmerRank(perm) for perm in itertools.permutations(range(n))] == list(range(math.factorial(n)))
+
+#=====================================================
+def test_solvable_3x3_every_index() -> None:
+    """Every 3x3 index unranks to a distinct solvable board that ranks back to it"""
+
+    size = BoardClass.getSize(3)
+    boards = set()
+    for index in range(solvableCount(size)):
+        arr = unrankSolvable(index, size)
+        assert size.parity(arr) == size.GoalParity
+        assert rankSolvable(arr, size) == index
+        boards.add(tuple(arr))
+
+    assert len(boards) == solvableCount(size) == 181440
+
+#=====================================================
+@pytest.mark.parametrize("N, samples", [(2, None), (4, 20000)])
+def test_solvable_round_trip(N: int, samples: int) -> None:
+    """Every 2x2 index (a random sample of the 4x4 ones, the first and last included) round trips"""
+
+    size = BoardClass.getSize(N)
+    count = solvableCount(size)
+    rng = random.Random(N)
+    indices = range(count) if samples is None else [0, count - 1] + [rng.randrange(count) for i in range(samples)]
+
+    for index in indices:
+        arr = unrankSolvable(index, size)
+        assert sorted(arr) == list(range(size.NN))
+        assert size.parity(arr) == size.GoalParity
+        assert rankSolvable(arr, size) == index
+
+#=====================================================
+def test_solvable_ranks_boards() -> None:
+    """rankSolvable() of random solvable boards is in range and unranks back to the board"""
+
+    rng = random.Random(3)
+    for N in (2, 3, 4):
+        size = BoardClass.getSize(N)
+        for i in range(2000):
+            arr = list(range(size.NN))
+            rng.shuffle(arr)
+            if size.parity(arr) != size.GoalParity:
+                # swapping two tiles (not the blank) flips the parity
+                first, second = [cell for cell in range(size.NN) if arr[cell] != 0][:2]
+                arr[first], arr[second] = arr[second], arr[first]
+
+            index = rankSolvable(arr, size)
+            assert 0 <= index < solvableCount(size)
+            assert unrankSolvable(index, size) == arr
+
+#=====================================================
+@pytest.mark.parametrize("N", [2, 3, 4])
+def test_unrank_array_matches_scalar(N: int) -> None:
+    """unrankSolvableArray() gives the same boards as unrankSolvable(), index by index"""
+
+    pytest.importorskip("numpy")
+
+    size = BoardClass.getSize(N)
+    count = solvableCount(size)
+    rng = random.Random(N)
+    indices = list(range(min(count, 5000))) + [count - 1] + [rng.randrange(count) for i in range(5000)]
+
+    assert unrankSolvableArray(indices, size).tolist() == [unrankSolvable(index, size) for index in indices]